@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from newsletter_autosave import write_json_atomic
+from newsletter_backup import BackupStore
+from newsletter_cache import RenderCache
+from newsletter_render import TEMPLATE_VERSION, CompiledTemplate, escape_attr, escape_text, write_html
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+MANIFEST_FILE = "manifest.json"
+INDEX_PAGE = "index.html"
+MANIFEST_VERSION = 1
+
+ARCHIVE_INDEX_TEMPLATE = """<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>뉴스레터 아카이브</title><style>body{{font-family:'Noto Sans KR',sans-serif;margin:0;background-color:#f0f2f5;color:#333}}main{{max-width:800px;margin:25px auto;padding:0 15px}}h1{{font-size:1.6em}}table{{width:100%;border-collapse:collapse;background-color:#fff;box-shadow:0 4px 12px rgba(0,0,0,0.1)}}th,td{{padding:10px 15px;border-bottom:1px solid #eee;text-align:left}}th{{background-color:#74438d;color:white}}a{{color:inherit}}</style></head><body><main><h1>뉴스레터 아카이브</h1><p>총 {issue_count}개 호</p><table><thead><tr><th>호수</th><th>발행일</th><th>제목</th><th>섹션</th></tr></thead><tbody>{rows_html}</tbody></table></main></body></html>"""
+ARCHIVE_ROW_TEMPLATE = """<tr><td><a href="{page}">제 {issue_no}호</a></td><td>{issue_date}</td><td><a href="{page}">{main_title}</a></td><td>{section_count}</td></tr>"""
+
+COMPILED_ARCHIVE_INDEX = CompiledTemplate(ARCHIVE_INDEX_TEMPLATE)
+COMPILED_ARCHIVE_ROW = CompiledTemplate(ARCHIVE_ROW_TEMPLATE)
+
+_UNSAFE_NAME_RE = re.compile(r"[^\w-]+")
+
+# =================================================================================
+# 아카이브 빌드
+# =================================================================================
+def page_name(version):
+    # 파일 이름에 쓸 수 없는 문자는 줄이고, 호 키의 해시를 붙여 서로 겹치지 않게 한다
+    key = "\0".join((version.main_title, version.issue_no, version.issue_date))
+    label = _UNSAFE_NAME_RE.sub("_", f"{version.issue_date}_{version.issue_no}").strip("_")[:60]
+    return f"{label or 'issue'}_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}.html"
+
+def issue_sort_key(version):
+    issue_no = version.issue_no.strip()
+    return ((0, int(issue_no)) if issue_no.isdigit() else (1, issue_no), version.issue_date)
+
+def load_manifest(path, optimize):
+    # (이전 페이지 목록, 건너뛰기에 쓸 수 있는지)를 돌려준다. 템플릿이나 출력 옵션이 바뀌었으면
+    # 해시는 믿을 수 없지만, 없어진 호의 페이지를 지우려면 목록은 여전히 필요하다
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}, False
+    reusable = manifest.get("version") == MANIFEST_VERSION and manifest.get("template_version") == TEMPLATE_VERSION and manifest.get("optimize") == optimize
+    return manifest.get("issues", {}), reusable
+
+def render_index(issues):
+    rows_html = "".join([
+        COMPILED_ARCHIVE_ROW.render(
+            page=escape_attr(name),
+            issue_no=escape_text(version.issue_no),
+            issue_date=escape_text(version.issue_date),
+            main_title=escape_text(version.main_title),
+            section_count=version.section_count
+        )
+        for version, name in issues
+    ])
+    return COMPILED_ARCHIVE_INDEX.render(issue_count=len(issues), rows_html=rows_html)
+
+def build_archive(store, output_dir, optimize=False, force=False):
+    # 매니페스트에 기록된 입력 해시와 비교해 새로 생기거나 바뀐 호만 다시 렌더링한다.
+    # 바뀌지 않은 호는 객체를 풀지도 않으므로 수천 개 호도 인덱스 조회 한 번으로 끝난다
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_FILE
+    previous, reusable = load_manifest(manifest_path, optimize)
+    skippable = previous if reusable and not force else {}
+
+    cache = RenderCache()
+    if optimize:
+        from newsletter_optimize import write_optimized_html
+    current, issues = {}, []
+    built = skipped = 0
+    for version, input_hash in store.latest_versions():
+        name = page_name(version)
+        current[name] = input_hash
+        issues.append((version, name))
+        if skippable.get(name) == input_hash and (output_dir / name).exists():
+            skipped += 1
+            continue
+        data = store.load(version.id)
+        if optimize:
+            write_optimized_html(data, output_dir / name, cache)
+        else:
+            write_html(data, output_dir / name, cache)
+        built += 1
+
+    removed = 0
+    for name in previous.keys() - current.keys():
+        (output_dir / name).unlink(missing_ok=True)
+        removed += 1
+
+    issues.sort(key=lambda item: issue_sort_key(item[0]), reverse=True)
+    (output_dir / INDEX_PAGE).write_text(render_index(issues), encoding='utf-8')
+    write_json_atomic(manifest_path, {"version": MANIFEST_VERSION, "template_version": TEMPLATE_VERSION, "optimize": optimize, "issues": current}, indent=None)
+    return built, skipped, removed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="백업 저장소의 모든 호를 정적 아카이브 사이트로 만듭니다.")
+    parser.add_argument("--root", default="backups", help="백업 디렉터리 (기본값: backups)")
+    parser.add_argument("-o", "--output-dir", default="archive", help="아카이브를 저장할 디렉터리 (기본값: archive)")
+    parser.add_argument("--optimize", action="store_true", help="출력 크기 최적화 적용")
+    parser.add_argument("--force", action="store_true", help="매니페스트를 무시하고 모든 호를 다시 생성")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    store = BackupStore(args.root)
+    try:
+        built, skipped, removed = build_archive(store, args.output_dir, args.optimize, args.force)
+    finally:
+        store.close()
+    elapsed = time.perf_counter() - started
+    print(f"{built}개 생성, {skipped}개 건너뜀, {removed}개 삭제 / {elapsed:.2f}초 -> {Path(args.output_dir) / INDEX_PAGE}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import json
+import threading
+from pathlib import Path
+
+from newsletter_profile import profiler
+from newsletter_render import atomic_output
+
+# =================================================================================
+# 원자적 JSON 쓰기
+# =================================================================================
+def write_json_atomic(path, data, indent=4):
+    # HTML 출력과 같은 atomic_output으로 쓰되 fsync까지 하므로, 도중에 죽어도 기존 파일은 온전하다.
+    # 기록한 바이트 수를 돌려준다
+    encoded = json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+    with atomic_output(path, fsync=True) as f:
+        f.write(encoded)
+    return len(encoded)
+
+# =================================================================================
+# 백그라운드 저장 스레드
+# =================================================================================
+class SavedCallbackError(Exception):
+    # 파일은 저장되었지만 on_saved 후처리(검색 색인 등)가 실패했음을 나타낸다
+    pass
+
+class AutosaveWriter:
+    # 가장 최근 스냅샷만 유지하는 write-behind 저장기. Tk 호출은 하지 않는다.
+    # on_saved는 저장이 끝난 뒤 같은 백그라운드 스레드에서 스냅샷과 함께 호출된다
+    def __init__(self, path, on_saved=None):
+        self.path = Path(path)
+        self.on_saved = on_saved
+        self.saves = 0
+        self._cond = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("자동 저장기가 이미 종료되었습니다.")
+            self._pending = data
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+            return self.pop_error()
+
+    def pop_error(self):
+        with self._cond:
+            error, self._error = self._error, None
+            return error
+
+    def close(self, timeout=None):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return self.pop_error()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                data, self._pending = self._pending, None
+                self._busy = True
+            try:
+                with profiler.span("autosave_write"):
+                    written = write_json_atomic(self.path, data)
+                profiler.count(f"bytes:{self.path.name}", written)
+                saved, error = True, None
+                if self.on_saved:
+                    try:
+                        self.on_saved(data)
+                    except Exception as e:
+                        error = SavedCallbackError(e)
+            except Exception as e:
+                saved, error = False, e
+            with self._cond:
+                self._busy = False
+                if saved:
+                    self.saves += 1
+                if error is not None:
+                    self._error = error
+                self._cond.notify_all()
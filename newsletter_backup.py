@@ -0,0 +1,258 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+from newsletter_render import write_html
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+INDEX_FILE = "index.sqlite3"
+OBJECTS_DIR = "objects"
+COMPRESS_LEVEL = 6
+# 호(제목·호수·날짜)마다 남겨둘 백업 버전 수
+BACKUP_KEEP_VERSIONS = 50
+
+BackupVersion = namedtuple("BackupVersion", "id main_title issue_no issue_date saved_at section_count size")
+
+# =================================================================================
+# 백업 저장소
+# =================================================================================
+class BackupStore:
+    # 헤더와 섹션을 각각 내용 해시로 압축 저장하고, 버전 목록은 SQLite 인덱스에 둔다.
+    # 바뀌지 않은 섹션은 여러 버전이 같은 객체를 공유한다
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects_dir = self.root / OBJECTS_DIR
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.root / INDEX_FILE))
+        with self._db:
+            self._db.execute("""CREATE TABLE IF NOT EXISTS versions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                main_title TEXT NOT NULL,
+                issue_no TEXT NOT NULL,
+                issue_date TEXT NOT NULL,
+                saved_at REAL NOT NULL,
+                header_hash TEXT NOT NULL,
+                section_hashes TEXT NOT NULL,
+                size INTEGER NOT NULL)""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS versions_issue ON versions (main_title, issue_no, issue_date, saved_at)")
+
+    def close(self):
+        self._db.close()
+
+    # ---- 객체 저장 -------------------------------------------------------------
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _put_object(self, obj):
+        payload = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(payload, COMPRESS_LEVEL))
+            os.replace(tmp_name, path)
+        return digest, len(payload)
+
+    def _get_object(self, digest):
+        return json.loads(zlib.decompress(self._object_path(digest).read_bytes()).decode("utf-8"))
+
+    # ---- 버전 -----------------------------------------------------------------
+    def save(self, data, saved_at=None):
+        header = data.get("header", {})
+        header_hash, size = self._put_object(header)
+        section_hashes = []
+        for section_data in data.get("sections", []):
+            digest, section_size = self._put_object(section_data)
+            section_hashes.append(digest)
+            size += section_size
+        key = (header.get("main_title", ""), header.get("issue_no", ""), header.get("issue_date", ""))
+        hashes_json = json.dumps(section_hashes)
+
+        # 직전 버전과 내용이 같으면 새 버전을 만들지 않는다
+        latest = self._db.execute(
+            "SELECT id, header_hash, section_hashes FROM versions WHERE main_title = ? AND issue_no = ? AND issue_date = ? ORDER BY saved_at DESC, id DESC LIMIT 1",
+            key
+        ).fetchone()
+        if latest and latest[1] == header_hash and latest[2] == hashes_json:
+            return latest[0]
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO versions (main_title, issue_no, issue_date, saved_at, header_hash, section_hashes, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, saved_at if saved_at is not None else time.time(), header_hash, hashes_json, size)
+            )
+        return cursor.lastrowid
+
+    def list_versions(self, main_title=None, issue_no=None, issue_date=None, limit=None):
+        clauses, params = [], []
+        for column, value in (("main_title", main_title), ("issue_no", issue_no), ("issue_date", issue_date)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        query = "SELECT id, main_title, issue_no, issue_date, saved_at, section_hashes, size FROM versions"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY saved_at DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [
+            BackupVersion(row[0], row[1], row[2], row[3], row[4], len(json.loads(row[5])), row[6])
+            for row in self._db.execute(query, params)
+        ]
+
+    def latest_versions(self):
+        # 호마다 가장 최근 버전과, 헤더·섹션 객체 해시로 만든 내용 해시를 돌려준다.
+        # 객체를 풀지 않고도 호 내용이 바뀌었는지 알 수 있다
+        rows = self._db.execute(
+            "SELECT id, main_title, issue_no, issue_date, MAX(saved_at), section_hashes, size, header_hash FROM versions GROUP BY main_title, issue_no, issue_date"
+        )
+        return [
+            (BackupVersion(row[0], row[1], row[2], row[3], row[4], len(json.loads(row[5])), row[6]), hashlib.sha256(f"{row[7]}:{row[5]}".encode("utf-8")).hexdigest())
+            for row in rows
+        ]
+
+    def load(self, version_id):
+        row = self._db.execute("SELECT header_hash, section_hashes FROM versions WHERE id = ?", (version_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"백업 버전 #{version_id}을(를) 찾을 수 없습니다.")
+        return {
+            "header": self._get_object(row[0]),
+            "sections": [self._get_object(digest) for digest in json.loads(row[1])]
+        }
+
+    def render(self, version_id, dest, cache=None):
+        return write_html(self.load(version_id), dest, cache)
+
+    def prune(self, keep_last=None, max_age_days=None, issue=None, collect=True):
+        # 호(제목·호수·날짜)마다 최신 keep_last개는 남기고, 그보다 오래된 버전 중 max_age_days가 지난 것을 지운다.
+        # 호마다 가장 최근 버전은 어떤 정책으로도 지우지 않는다.
+        # issue를 주면 그 호의 버전만 인덱스로 조회한다. collect=False면 객체 정리는 collect_garbage(CLI gc)로 미룬다
+        if keep_last is None and max_age_days is None:
+            return 0
+        doomed = set()
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        query = "SELECT id, main_title, issue_no, issue_date, saved_at FROM versions"
+        if issue is not None:
+            query += " WHERE main_title = ? AND issue_no = ? AND issue_date = ?"
+        rows = self._db.execute(query + " ORDER BY saved_at DESC, id DESC", tuple(issue or ()))
+        seen = {}
+        for version_id, main_title, issue_no, issue_date, saved_at in rows:
+            key = (main_title, issue_no, issue_date)
+            rank = seen[key] = seen.get(key, 0) + 1
+            if rank == 1:
+                continue
+            if (keep_last is not None and rank > keep_last) or (cutoff is not None and saved_at < cutoff):
+                doomed.add(version_id)
+        if doomed:
+            with self._db:
+                self._db.executemany("DELETE FROM versions WHERE id = ?", [(version_id,) for version_id in doomed])
+            if collect:
+                self.collect_garbage()
+        return len(doomed)
+
+    def collect_garbage(self):
+        referenced = set()
+        for header_hash, section_hashes in self._db.execute("SELECT header_hash, section_hashes FROM versions"):
+            referenced.add(header_hash)
+            referenced.update(json.loads(section_hashes))
+        removed = 0
+        for path in self.objects_dir.glob("*/*"):
+            if path.parent.name + path.name not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def import_json(self, path):
+        # 예전 방식의 backups/*.json 파일을 파일 수정 시각으로 가져온다
+        path = Path(path)
+        with path.open('r', encoding='utf-8') as f:
+            data = json.load(f)
+        return self.save(data, saved_at=path.stat().st_mtime)
+
+# =================================================================================
+# CLI
+# =================================================================================
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뉴스레터 백업 저장소를 관리합니다.")
+    parser.add_argument("--root", default="backups", help="백업 디렉터리 (기본값: backups)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="저장된 버전 목록")
+    list_parser.add_argument("--title")
+    list_parser.add_argument("--issue-no")
+    list_parser.add_argument("--date")
+    list_parser.add_argument("-n", "--limit", type=int)
+
+    restore_parser = commands.add_parser("restore", help="버전을 JSON으로 복원")
+    restore_parser.add_argument("version", type=int)
+    restore_parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본값: 표준 출력)")
+
+    render_parser = commands.add_parser("render", help="버전을 HTML로 렌더링")
+    render_parser.add_argument("version", type=int)
+    render_parser.add_argument("-o", "--output", required=True)
+
+    prune_parser = commands.add_parser("prune", help="보존 정책에 따라 오래된 버전 삭제")
+    prune_parser.add_argument("--keep", type=int, help="호마다 남길 최신 버전 수")
+    prune_parser.add_argument("--days", type=float, help="이 일수보다 오래된 버전 삭제")
+
+    commands.add_parser("gc", help="어느 버전도 참조하지 않는 객체 삭제")
+
+    import_parser = commands.add_parser("import", help="예전 백업 JSON 파일 가져오기")
+    import_parser.add_argument("files", nargs="+")
+
+    args = parser.parse_args(argv)
+    store = BackupStore(args.root)
+    try:
+        if args.command == "list":
+            for version in store.list_versions(args.title, args.issue_no, args.date, args.limit):
+                print(f"#{version.id}\t{format_time(version.saved_at)}\t{version.main_title}\t제 {version.issue_no}호\t{version.issue_date}\t섹션 {version.section_count}개\t{version.size:,} 바이트")
+        elif args.command == "restore":
+            text = json.dumps(store.load(args.version), ensure_ascii=False, indent=4)
+            if args.output == "-":
+                print(text)
+            else:
+                Path(args.output).write_text(text, encoding='utf-8')
+        elif args.command == "render":
+            written = store.render(args.version, args.output)
+            print(f"{args.output}: {written:,} 바이트")
+        elif args.command == "prune":
+            print(f"{store.prune(args.keep, args.days)}개 버전 삭제")
+        elif args.command == "gc":
+            print(f"{store.collect_garbage()}개 객체 삭제")
+        elif args.command == "import":
+            for path in args.files:
+                print(f"{path} -> #{store.import_json(path)}")
+        if args.command in ("prune", "import"):
+            # 지워진 버전을 가리키거나 아직 색인되지 않은 호가 검색 색인에 남지 않도록 맞춘다
+            from newsletter_search import INDEX_FILE as SEARCH_INDEX_FILE, SearchIndex
+            index = SearchIndex(Path(args.root) / SEARCH_INDEX_FILE)
+            try:
+                reindexed, removed = index.sync(store)
+            finally:
+                index.close()
+            print(f"검색 색인: {reindexed}개 호 갱신, {removed}개 호 삭제")
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
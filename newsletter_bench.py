@@ -0,0 +1,261 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from newsletter_autosave import write_json_atomic
+from newsletter_backup import BackupStore
+from newsletter_cache import RenderCache
+from newsletter_render import render_html
+from newsletter_search import SearchIndex, save_backup
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+REPORT_FILE = "bench_report.json"
+REPORT_VERSION = 1
+REGRESSION_THRESHOLD = 0.10
+VIRTUAL_DISPLAY = ":99"
+SECTION_COLORS = ["#74438d", "#f1b34a", "#4a6da7", "#509598", "#616161"]
+
+KOREAN_WORDS = "지역 소식 안내 행사 참여 신청 마감 일정 변경 주민 센터 공지 교육 프로그램 모집 결과 발표 감사 인사 협력 회의 예산 지원 사업 홍보".split()
+LATIN_WORDS = "community update event notice schedule program meeting report budget support project volunteer workshop registration deadline".split()
+
+# =================================================================================
+# 합성 뉴스레터 생성
+# =================================================================================
+def _text(rng, length, korean_ratio):
+    words, size = [], 0
+    while size < length:
+        word = rng.choice(KOREAN_WORDS if rng.random() < korean_ratio else LATIN_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+def generate_issue(sections=10, contents=5, body_length=300, korean_ratio=0.7, seed=0):
+    # 같은 인자와 seed면 항상 같은 문서를 만들어 실행 간 비교가 가능하다
+    rng = random.Random(seed)
+    return {
+        "header": {"main_title": _text(rng, 12, korean_ratio), "issue_no": str(rng.randint(1, 999)), "issue_date": "2026-01-01"},
+        "sections": [
+            {
+                "sidebar_title": _text(rng, 6, korean_ratio),
+                "title": _text(rng, 20, korean_ratio),
+                "color": SECTION_COLORS[section_index % len(SECTION_COLORS)],
+                "contents": [
+                    {
+                        "title": _text(rng, 24, korean_ratio),
+                        "body": "\n".join(_text(rng, body_length // 3 or 1, korean_ratio) for _ in range(3)),
+                        "link": f"https://example.com/{section_index}/{content_index}" if rng.random() < 0.5 else "",
+                        "color": "",
+                        "is_bold": rng.random() < 0.3
+                    }
+                    for content_index in range(contents)
+                ]
+            }
+            for section_index in range(sections)
+        ]
+    }
+
+def _edit_one_content(data):
+    edited = json.loads(json.dumps(data))
+    if edited["sections"] and edited["sections"][0]["contents"]:
+        edited["sections"][0]["contents"][0]["body"] += " 수정"
+    return edited
+
+# =================================================================================
+# 측정
+# =================================================================================
+def measure(func, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        started = time.perf_counter()
+        func(state) if setup else func()
+        timings.append(time.perf_counter() - started)
+    return {"runs": repeat, "min": min(timings), "median": statistics.median(timings), "mean": statistics.fmean(timings)}
+
+def bench_headless(data, repeat, work_dir):
+    results = {}
+    edited = _edit_one_content(data)
+
+    results["render_cold"] = measure(lambda: render_html(data), repeat)
+    warm_cache = RenderCache()
+    render_html(data, warm_cache)
+    results["render_warm"] = measure(lambda: render_html(data, warm_cache), repeat)
+    results["render_one_edit"] = measure(lambda cache: render_html(edited, cache), repeat, setup=lambda: _warmed_cache(data))
+
+    data_file = work_dir / "newsletter_data.json"
+    results["json_save"] = measure(lambda: write_json_atomic(data_file, data), repeat)
+    results["json_load"] = measure(lambda: json.loads(data_file.read_text(encoding='utf-8')), repeat)
+
+    # App.manual_save와 같은 save_backup을 잰다
+    def backup(state):
+        store, index, payload = state
+        save_backup(store, index, payload)
+
+    counter = iter(range(sys.maxsize))
+    def fresh_store(payload):
+        root = work_dir / f"backups_{next(counter)}"
+        return BackupStore(root), SearchIndex(root / "search.sqlite3"), payload
+
+    def seeded_store():
+        state = fresh_store(edited)
+        backup(state[:2] + (data,))
+        return state
+
+    results["backup_first"] = measure(backup, repeat, setup=lambda: fresh_store(data))
+    results["backup_one_edit"] = measure(backup, repeat, setup=seeded_store)
+    return results
+
+def _warmed_cache(data):
+    cache = RenderCache()
+    render_html(data, cache)
+    return cache
+
+@contextlib.contextmanager
+def virtual_display():
+    # 이미 화면이 있으면 그대로 쓰고, 없으면 Xvfb를 띄운다. 둘 다 없으면 None
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        yield None
+        return
+    process = subprocess.Popen([xvfb, VIRTUAL_DISPLAY, "-screen", "0", "1280x1024x24"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = VIRTUAL_DISPLAY
+    try:
+        time.sleep(0.5)
+        yield VIRTUAL_DISPLAY
+    finally:
+        del os.environ["DISPLAY"]
+        process.terminate()
+        process.wait()
+
+def bench_gui(data, repeat, work_dir):
+    # newsletter_generator는 임포트 시점의 작업 디렉터리를 데이터 위치로 쓰므로 임시 디렉터리에서 불러온다
+    import tkinter as tk
+    previous_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        import newsletter_generator
+        root = tk.Tk()
+        app = newsletter_generator.App(root)
+        root.update()
+
+        def populate():
+            app._populate_ui_from_data(data)
+            app._finish_load()
+            root.update_idletasks()
+
+        empty = {"header": data["header"], "sections": []}
+        results = {
+            "populate_empty": measure(lambda _: populate(), repeat, setup=lambda: app._populate_ui_from_data(empty) or app._finish_load()),
+            "populate_reuse": measure(populate, repeat),
+        }
+        results["get_data"] = measure(app.get_data, repeat)
+        snapshot = app.get_data()
+        results["get_html_content"] = measure(lambda: app.get_html_content(snapshot), repeat)
+
+        app.autosave.close()
+        app.render_cache.close()
+        app.backup_store.close()
+        app.search_index.close()
+        root.destroy()
+        return results
+    finally:
+        os.chdir(previous_cwd)
+
+def run_benchmarks(params, repeat, gui=True):
+    data = generate_issue(**params)
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "document_bytes": len(json.dumps(data, ensure_ascii=False).encode("utf-8")),
+        "results": {},
+        "skipped": []
+    }
+    with tempfile.TemporaryDirectory(prefix="newsletter_bench_") as tmp:
+        work_dir = Path(tmp)
+        report["results"].update(bench_headless(data, repeat, work_dir))
+        if not gui:
+            report["skipped"].append("gui: --no-gui")
+            return report
+        with virtual_display() as display:
+            if display is None:
+                report["skipped"].append("gui: DISPLAY와 Xvfb가 없음")
+            else:
+                report["results"].update(bench_gui(data, repeat, work_dir))
+    return report
+
+# =================================================================================
+# 보고서 비교
+# =================================================================================
+def compare_reports(baseline, current, threshold=REGRESSION_THRESHOLD):
+    # 잡음이 적은 최소값 기준으로 비교해 (이름, 이전, 현재, 비율, 회귀 여부) 목록을 돌려준다
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        ratio = result["min"] / before["min"] if before["min"] > 0 else float("inf")
+        rows.append((name, before["min"], result["min"], ratio, ratio > 1 + threshold))
+    return rows
+
+def _format_ms(seconds):
+    return f"{seconds * 1000:10.2f} ms"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 뉴스레터로 렌더링·저장·불러오기 성능을 측정합니다.")
+    parser.add_argument("--sections", type=int, default=20, help="섹션 수 (기본값: 20)")
+    parser.add_argument("--contents", type=int, default=10, help="섹션당 콘텐츠 수 (기본값: 10)")
+    parser.add_argument("--body-length", type=int, default=300, help="콘텐츠 본문 길이(글자) (기본값: 300)")
+    parser.add_argument("--korean", type=float, default=0.7, help="한글 단어 비율 0~1 (기본값: 0.7)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="항목당 반복 횟수 (기본값: 5)")
+    parser.add_argument("-o", "--output", default=REPORT_FILE, help=f"JSON 보고서 파일 (기본값: {REPORT_FILE})")
+    parser.add_argument("--compare", metavar="BASELINE", help="이전 보고서와 비교해 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="회귀로 볼 최소값 증가 비율 (기본값: 0.10)")
+    parser.add_argument("--no-gui", action="store_true", help="화면이 필요한 항목은 건너뜀")
+    args = parser.parse_args(argv)
+
+    params = {"sections": args.sections, "contents": args.contents, "body_length": args.body_length, "korean_ratio": args.korean, "seed": args.seed}
+    report = run_benchmarks(params, args.repeat, gui=not args.no_gui)
+    write_json_atomic(args.output, report, indent=2)
+
+    print(f"문서 {report['document_bytes']:,} 바이트 (섹션 {args.sections}개 x 콘텐츠 {args.contents}개)")
+    for name, result in report["results"].items():
+        print(f"{name:20}{_format_ms(result['median'])}  (최소{_format_ms(result['min'])})")
+    for reason in report["skipped"]:
+        print(f"건너뜀: {reason}")
+    print(f"보고서: {args.output}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("params") != report["params"]:
+        print("경고: 기준 보고서와 측정 조건이 다릅니다.", file=sys.stderr)
+    regressions = 0
+    print(f"\n{args.compare} 대비 (최소값)")
+    for name, before, after, ratio, regressed in compare_reports(baseline, report, args.threshold):
+        regressions += regressed
+        print(f"{name:20}{_format_ms(before)} ->{_format_ms(after)}  {ratio:6.2f}x{'  회귀' if regressed else ''}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
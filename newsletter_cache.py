@@ -0,0 +1,83 @@
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+
+# =================================================================================
+# 렌더링 조각 캐시
+# =================================================================================
+class RenderCache:
+    # 메모리 LRU + 선택적 SQLite 저장소. 키는 newsletter_render.fragment_key가 만드는 튜플이다
+    def __init__(self, max_entries=4096, path=None, max_disk_entries=50000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(str(path))
+                self._db.execute("CREATE TABLE IF NOT EXISTS fragments (key TEXT PRIMARY KEY, html TEXT NOT NULL)")
+                self._db.commit()
+            except sqlite3.DatabaseError:
+                # 캐시 파일이 손상되었으면 메모리 캐시만 사용
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        fragment = self._entries.get(key)
+        if fragment is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fragment
+        if self._db is not None:
+            disk_key = self._disk_key(key)
+            row = self._db.execute("SELECT html FROM fragments WHERE key = ?", (disk_key,)).fetchone()
+            if row:
+                self._remember(key, row[0])
+                # 다시 기록해 rowid를 새로 받게 한다. 오래된 rowid부터 지우므로 자주 쓰는 조각이 남는다
+                self._pending[disk_key] = row[0]
+                self.hits += 1
+                return row[0]
+        self.misses += 1
+        return None
+
+    def put(self, key, fragment):
+        self._remember(key, fragment)
+        if self._db is not None:
+            self._pending[self._disk_key(key)] = fragment
+
+    @staticmethod
+    def _disk_key(key):
+        return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _remember(self, key, fragment):
+        self._entries[key] = fragment
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def flush(self):
+        if self._db is None or not self._pending:
+            return
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO fragments (key, html) VALUES (?, ?)", self._pending.items())
+            self._db.execute("DELETE FROM fragments WHERE rowid <= (SELECT MAX(rowid) FROM fragments) - ?", (self.max_disk_entries,))
+        self._pending.clear()
+
+    def clear(self):
+        self._entries.clear()
+        self._pending.clear()
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM fragments")
+
+    def close(self):
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
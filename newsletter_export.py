@@ -0,0 +1,185 @@
+import argparse
+import base64
+import hashlib
+import html
+import json
+import logging
+import mimetypes
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from newsletter_optimize import _STYLE_BLOCK_RE
+from newsletter_render import atomic_output, render_html
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+FONT_DIR_NAME = "fonts"
+CACHE_DIR_NAME = ".asset_cache"
+FONT_FAMILY = "Noto Sans KR"
+FONT_EXTENSIONS = (".woff2", ".woff", ".ttf", ".otf")
+FONT_WEIGHTS = (("thin", "100"), ("extralight", "200"), ("light", "300"), ("regular", "400"), ("medium", "500"),
+                ("semibold", "600"), ("extrabold", "800"), ("bold", "700"), ("black", "900"))
+FONT_MIME_TYPES = {".woff2": "font/woff2", ".woff": "font/woff", ".ttf": "font/ttf", ".otf": "font/otf"}
+
+_FONT_LINK_RE = re.compile(r'<link href="https://fonts\.googleapis\.com/[^"]*" rel="stylesheet">')
+_CSS_URL_RE = re.compile(r"url\('([^')]+)'\)")
+_STYLE_OR_HEAD_RE = re.compile(r"<(style|title)>.*?</\1>", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+ExportStats = namedtuple("ExportStats", "bytes_written images fonts glyphs subsetted cache_hits")
+
+# =================================================================================
+# 자산 캐시
+# =================================================================================
+class AssetCache:
+    # 인코딩된 data URI를 원본 내용 해시(+서브셋 글자)로 저장해 다음 내보내기에서 재사용한다
+    def __init__(self, root):
+        self.root = Path(root)
+        self.hits = 0
+
+    def get_or_create(self, key_parts, build):
+        digest = hashlib.sha256(b"\0".join(key_parts)).hexdigest()
+        path = self.root / f"{digest}.txt"
+        if path.exists():
+            self.hits += 1
+            return path.read_text(encoding="ascii")
+        value = build()
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(value, encoding="ascii")
+        tmp_path.replace(path)
+        return value
+
+def data_uri(mime_type, payload):
+    return f"data:{mime_type};base64,{base64.b64encode(payload).decode('ascii')}"
+
+# =================================================================================
+# 글꼴
+# =================================================================================
+def find_font_files(asset_dir):
+    font_dir = Path(asset_dir) / FONT_DIR_NAME
+    if not font_dir.is_dir():
+        return []
+    return sorted(path for path in font_dir.iterdir() if path.suffix.lower() in FONT_EXTENSIONS and path.name.lower().startswith("notosanskr"))
+
+def font_weight(path):
+    name = path.stem.lower()
+    if "[" in name or "variable" in name:
+        return "100 900"
+    for keyword, weight in FONT_WEIGHTS:
+        if keyword in name.rsplit("-", 1)[-1]:
+            return weight
+    return "400"
+
+def used_characters(document_html):
+    text = html.unescape(_TAG_RE.sub(" ", _STYLE_OR_HEAD_RE.sub(" ", document_html)))
+    return "".join(sorted(set(text) - {"\n", "\r", "\t"}))
+
+def _subset_font(payload, characters):
+    # fontTools가 있으면 문서에 쓰인 글자만 남긴다. woff2는 brotli가 있어야 하므로 없으면 woff로 저장
+    import io
+    logging.getLogger("fontTools").setLevel(logging.ERROR)
+    font = font_subset.load_font(io.BytesIO(payload), font_subset.Options())
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        options.flavor = "woff"
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text=characters)
+    subsetter.subset(font)
+    output = io.BytesIO()
+    font_subset.save_font(font, output, options)
+    return FONT_MIME_TYPES[f".{options.flavor}"], output.getvalue()
+
+def build_font_faces(font_files, characters, cache):
+    rules = []
+    for path in font_files:
+        payload = path.read_bytes()
+        if font_subset is not None:
+            build = lambda payload=payload: data_uri(*_subset_font(payload, characters))
+            key_parts = (b"font-subset", payload, characters.encode("utf-8"))
+        else:
+            build = lambda payload=payload, path=path: data_uri(FONT_MIME_TYPES[path.suffix.lower()], payload)
+            key_parts = (b"font", payload)
+        uri = cache.get_or_create(key_parts, build)
+        rules.append(f"@font-face{{font-family:'{FONT_FAMILY}';font-weight:{font_weight(path)};font-display:swap;src:url({uri})}}")
+    return "".join(rules)
+
+# =================================================================================
+# 오프라인 내보내기
+# =================================================================================
+def inline_assets(document_html, asset_dir, cache_dir=None):
+    asset_dir = Path(asset_dir)
+    asset_root = asset_dir.resolve()
+    cache = AssetCache(cache_dir or asset_dir / CACHE_DIR_NAME)
+    images = 0
+
+    def replace_url(match):
+        nonlocal images
+        target = match.group(1)
+        if target.startswith(("data:", "http:", "https:", "//")):
+            return match.group(0)
+        path = (asset_dir / target).resolve()
+        if not path.is_relative_to(asset_root) or not path.is_file():
+            # 자산 디렉터리 밖을 가리키거나 없는 로컬 이미지는 네트워크 없이도 열리도록 참조를 지운다
+            return "none"
+        payload = path.read_bytes()
+        mime_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        images += 1
+        return f"url('{cache.get_or_create((b'image', payload), lambda: data_uri(mime_type, payload))}')"
+
+    # 사용자 본문에 들어 있는 url('...') 글자가 파일 내용으로 바뀌지 않도록 <style> 블록 안에서만 바꾼다
+    document_html = _STYLE_BLOCK_RE.sub(lambda match: f"<style>{_CSS_URL_RE.sub(replace_url, match.group(1))}</style>", document_html)
+
+    font_files = find_font_files(asset_dir)
+    characters = used_characters(document_html)
+    font_css = build_font_faces(font_files, characters, cache) if font_files else ""
+    document_html = _FONT_LINK_RE.sub(lambda _: f"<style>{font_css}</style>" if font_css else "", document_html, count=1)
+    stats = ExportStats(0, images, len(font_files), len(characters), bool(font_files) and font_subset is not None, cache.hits)
+    return document_html, stats
+
+def export_offline(data, dest, asset_dir, cache_dir=None, render_cache=None, optimize=False):
+    document_html = render_html(data, render_cache)
+    if optimize:
+        from newsletter_optimize import optimize_html
+        document_html, _ = optimize_html(document_html)
+    document_html, stats = inline_assets(document_html, asset_dir, cache_dir)
+    encoded = document_html.encode("utf-8")
+    with atomic_output(dest) as f:
+        f.write(encoded)
+    return stats._replace(bytes_written=len(encoded))
+
+def describe_stats(stats):
+    if not stats.fonts:
+        font_text = "글꼴 파일 없음(시스템 글꼴 사용)"
+    elif stats.subsetted:
+        font_text = f"글꼴 {stats.fonts}개를 {stats.glyphs}자로 서브셋"
+    else:
+        font_text = f"글꼴 {stats.fonts}개 전체 포함(fontTools 미설치)"
+    return f"{stats.bytes_written:,} 바이트 · 이미지 {stats.images}개 · {font_text} · 캐시 재사용 {stats.cache_hits}건"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네트워크 없이 열리는 단일 HTML 파일로 내보냅니다.")
+    parser.add_argument("input", help="뉴스레터 JSON 파일")
+    parser.add_argument("-o", "--output", required=True, help="출력 HTML 파일")
+    parser.add_argument("--assets", default=".", help=f"헤더 이미지와 {FONT_DIR_NAME}/ 디렉터리가 있는 위치 (기본값: 현재 디렉터리)")
+    parser.add_argument("--optimize", action="store_true", help="출력 크기 최적화도 함께 적용")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    print(describe_stats(export_offline(data, args.output, args.assets, optimize=args.optimize)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
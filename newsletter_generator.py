@@ -1,11 +1,22 @@
+import time
+STARTED_AT = time.perf_counter()
+
 import tkinter as tk
-from tkinter import scrolledtext, messagebox, Canvas, Frame, Scrollbar, colorchooser, filedialog
+from tkinter import ttk, scrolledtext, messagebox, Canvas, Frame, Scrollbar
 import json
-import webbrowser
+import os
 import uuid
-import re
 from pathlib import Path
 
+from newsletter_autosave import AutosaveWriter, SavedCallbackError
+from newsletter_backup import BackupStore, format_time
+from newsletter_cache import RenderCache
+from newsletter_model import Content, Document, Section
+from newsletter_optimize import describe_stats, write_optimized_html
+from newsletter_profile import count_widgets, profiler
+from newsletter_render import COLOR_INFO, render_html, write_html
+from newsletter_search import INDEX_FILE as SEARCH_INDEX_FILE, WORKING_DOC_ID, SearchIndex, describe_location, save_backup
+
 # =================================================================================
 # 상수 정의
 # =================================================================================
@@ -13,28 +24,28 @@ CWD = Path.cwd()
 BACKUP_DIR = CWD / "backups"
 DATA_FILE = CWD / "newsletter_data.json"
 OUTPUT_FILE = CWD / "newsletter.html"
+RENDER_CACHE_FILE = CWD / "render_cache.db"
 
 APP_FONT = "굴림 10"
 RECOMMENDED_COLORS = ["#74438d", "#f1b34a", "#4a6da7", "#509598", "#616161"]
 COLOR_SUCCESS = "#28a745"
 COLOR_PRIMARY = "#007bff"
 COLOR_DANGER = "#dc3545"
-COLOR_INFO = "#6c757d"
 
-# =================================================================================
-# HTML 템플릿
-# =================================================================================
-HTML_TEMPLATE = """
-<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>{html_title}</title><link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet"><style>body{{font-family:'Noto Sans KR',sans-serif;margin:0;background-color:#f0f2f5;color:#333}}.header{{display:flex;justify-content:space-between;align-items:center;background-image:url('your_header_img_here.jpg');background-size:cover;background-position:center;padding:20px 40px;color:white;min-height:150px;position:relative;z-index:1}}.header::before{{content:'';position:absolute;top:0;left:0;right:0;bottom:0;background-color:rgba(0,0,0,0.4);z-index:2}}.header .logo,.header .issue-info{{z-index:3;position:relative}}.header .logo-text{{font-size:2.5em;font-weight:bold;text-shadow:2px 2px 4px rgba(0,0,0,0.7)}}.header .issue-info{{font-size:1.2em;background-color:#f1b34a;padding:8px 15px;border-radius:5px;position:absolute;right:40px;bottom:20px}}.container{{padding:20px}}.info-card{{display:flex;width:100%;max-width:800px;margin:25px auto;border-radius:10px;overflow:hidden;box-shadow:0 4px 12px rgba(0,0,0,0.1);background-color:#fff}}.card-sidebar{{display:flex;justify-content:center;align-items:center;flex-shrink:0;width:70px;padding:20px 0;writing-mode:vertical-rl;text-orientation:mixed;color:white;font-size:1.5em;font-weight:700;letter-spacing:2px;text-align:center;transition:all 0.3s ease}}.card-main{{flex-grow:1;display:flex;flex-direction:column}}.main-header{{padding:12px 20px;color:white;font-size:1.2em;font-weight:700}}.main-content{{padding:20px;line-height:1.8}}.content-item{{margin-bottom:20px;border-bottom:1px solid #eee;padding-bottom:15px}}.content-item:last-child{{border-bottom:none;margin-bottom:0;padding-bottom:0}}.content-item-title{{font-size:1.1em;font-weight:500;margin-bottom:8px}}.content-item-body{{color:#555}}a{{text-decoration:none;color:inherit}}a:hover{{text-decoration:underline}}@media (max-width:768px){{.header{{padding:20px 15px}}.header .logo-text{{font-size:2em}}.header .issue-info{{font-size:1em;padding:6px 10px;right:15px;bottom:15px}}.container{{padding:15px 10px}}.info-card{{flex-direction:column;margin:15px auto;border-left:none}}.card-sidebar{{writing-mode:horizontal-tb;text-orientation:initial;width:auto;padding:10px 15px;justify-content:flex-start;font-size:1.3em}}.main-content{{padding:15px}}}}</style></head><body><header class="header"><div class="logo"><span class="logo-text">{main_title}</span></div><div class="issue-info">제 {issue_no}호 / {issue_date}</div></header><main class="container">{sections_html}</main></body></html>
-"""
+AUTOSAVE_CHECK_MS = 1000
+AUTOSAVE_DEBOUNCE_SEC = 2.0
+AUTOSAVE_MAX_DELAY_SEC = 30.0
+MODIFIED_EVENT = "<<NewsletterModified>>"
+
+# 콘텐츠가 많은 호를 위해 화면 근처의 섹션/콘텐츠만 위젯으로 만드는 모드
+VIRTUAL_EDITOR = os.environ.get("NEWSLETTER_VIRTUAL_EDITOR") == "1"
+VIRTUAL_MARGIN_PX = 400
 
-SECTION_TEMPLATE = """
-<div class="info-card" style="border-left:5px solid {color};"><div class="card-sidebar" style="background-color:{color};">{sidebar_title}</div><div class="card-main"><div class="main-header" style="background-color:{color};">{section_title}</div><div class="main-content">{contents_html}</div></div></div>
-"""
+# 불러오기는 after 콜백 한 번에 이 시간만큼만 위젯을 만들고 화면에 양보한다
+LOAD_SLICE_SEC = 0.03
 
-CONTENT_TEMPLATE = """
-<div class="content-item"><div class="content-item-title" style="color:{color};font-weight:{font_weight};">{content_title}</div><div class="content-item-body">{content_body}</div></div>
-"""
+# 실시간 미리보기: 연속 입력은 이 간격으로 묶어 변경된 조각만 보낸다
+PREVIEW_DEBOUNCE_MS = 50
 
 # =================================================================================
 # 메인 애플리케이션 클래스
@@ -47,24 +58,67 @@ class App:
         self.root.option_add("*Font", APP_FONT)
 
         self.header_widgets = {}
+        self.header_vars = {}
         self.sections = []
+        self.document = Document()
+        self.virtual_editor = VIRTUAL_EDITOR
+        self.section_pool = []
+        self._viewport_pending = False
+        self._load_steps = None
+        self._load_job = None
+        self.startup_time = 0.0
+        self.render_cache = RenderCache(path=RENDER_CACHE_FILE)
+        self.autosave = AutosaveWriter(DATA_FILE, on_saved=self._index_working_copy)
+        self.dirty_since = None
+        self.last_edit = 0.0
+        self.preview = None
+        self._preview_job = None
 
         BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        self.backup_store = BackupStore(BACKUP_DIR)
+        self.search_index = SearchIndex(BACKUP_DIR / SEARCH_INDEX_FILE)
 
         self.setup_ui()
-        self.load_data()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after(AUTOSAVE_CHECK_MS, self._autosave_tick)
+        # 창을 먼저 띄운 뒤 데이터를 나누어 불러온다
+        self.root.after_idle(self._on_first_idle)
+        if profiler.enabled:
+            self.open_profile_panel()
+
+    def _on_first_idle(self):
+        self.startup_time = time.perf_counter() - STARTED_AT
+        self.set_status(f"시작 {self.startup_time:.2f}초")
+        self.load_data()
+
+    def set_status(self, text):
+        self.status_label.config(text=text)
 
     def setup_ui(self):
+        menubar = tk.Menu(self.root)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        self.profile_enabled = tk.BooleanVar(value=profiler.enabled)
+        tools_menu.add_checkbutton(label="성능 계측", variable=self.profile_enabled, command=self.toggle_profiling)
+        tools_menu.add_command(label="성능 통계 창", command=self.open_profile_panel)
+        menubar.add_cascade(label="도구", menu=tools_menu)
+        self.root.config(menu=menubar)
+        self.profile_panel = None
+
+        status_frame = Frame(self.root, bd=1, relief="sunken")
+        status_frame.pack(side="bottom", fill="x")
+        self.status_label = tk.Label(status_frame, anchor="w", fg=COLOR_INFO)
+        self.status_label.pack(side="left", fill="x", expand=True, padx=5)
+        self.progress = ttk.Progressbar(status_frame, length=200, mode="determinate")
+
         self.canvas = Canvas(self.root, bd=0, highlightthickness=0)
         self.scrollbar = Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = Frame(self.canvas)
 
         self.canvas_window = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_canvas_yview)
         
         self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        self.canvas.bind("<Configure>", lambda e: self.canvas.itemconfig(self.canvas_window, width=e.width))
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
         
         self.canvas.pack(side="left", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
@@ -72,6 +126,7 @@ class App:
         self.root.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
         self.root.bind_all("<Button-4>", self._on_mousewheel, add="+")
         self.root.bind_all("<Button-5>", self._on_mousewheel, add="+")
+        self.root.bind_all(MODIFIED_EVENT, self.mark_dirty, add="+")
 
         header_frame = tk.LabelFrame(self.scrollable_frame, text="헤더 정보", padx=15, pady=15)
         header_frame.pack(fill="x", padx=10, pady=10)
@@ -84,6 +139,10 @@ class App:
         control_frame.pack(fill="x", padx=10, pady=20)
         tk.Button(control_frame, text="섹션 추가 (+)", command=self.add_section, bg=COLOR_PRIMARY, fg="white").pack(side="left", padx=5)
         tk.Button(control_frame, text="HTML 생성 및 열기", command=self.generate_html, font=(APP_FONT.split()[0], 12, "bold"), bg=COLOR_SUCCESS, fg="white").pack(side="right", padx=5)
+        self.optimize_output = tk.BooleanVar(value=False)
+        tk.Checkbutton(control_frame, text="출력 크기 최적화", variable=self.optimize_output).pack(side="right", padx=5)
+        tk.Button(control_frame, text="오프라인 내보내기", command=self.export_offline).pack(side="right", padx=5)
+        tk.Button(control_frame, text="실시간 미리보기", command=self.open_preview).pack(side="right", padx=5)
 
     def create_header_widgets(self, parent):
         tk.Label(parent, text="메인 제목:").grid(row=0, column=0, sticky="w", padx=5)
@@ -98,35 +157,148 @@ class App:
         button_frame.grid(row=1, column=2, sticky="w", pady=(5,0))
         tk.Button(button_frame, text="백업 저장", command=self.manual_save).pack(side="left", padx=(10, 2))
         tk.Button(button_frame, text="백업 불러오기", command=self.manual_load).pack(side="left")
+        tk.Button(button_frame, text="검색", command=lambda: SearchDialog(self)).pack(side="left", padx=(2, 0))
 
         tk.Label(parent, text="발행 날짜:").grid(row=2, column=0, sticky="w", padx=5, pady=(5,0))
         self.header_widgets['issue_date'] = tk.Entry(parent, width=20)
         self.header_widgets['issue_date'].grid(row=2, column=1, sticky="w", pady=(5,0))
         parent.columnconfigure(1, weight=1)
 
+        for key, widget in self.header_widgets.items():
+            var = tk.StringVar(value=getattr(self.document.header, key))
+            widget.config(textvariable=var)
+            var.trace_add("write", lambda *_, key=key, var=var: self._on_header_change(key, var))
+            self.header_vars[key] = var
+
+    def _on_header_change(self, key, var):
+        setattr(self.document.header, key, var.get())
+        self.mark_dirty()
+
     def add_section(self, data=None):
-        color_index = len(self.sections) % len(RECOMMENDED_COLORS)
-        initial_color = data.get("color") if data else RECOMMENDED_COLORS[color_index]
-        section = SectionFrame(self.sections_frame, self.remove_section, data, initial_color)
-        section.pack(fill="x", pady=(0, 15), expand=True, padx=5)
-        self.sections.append(section)
+        self._finish_load()
+        if data:
+            model = Section.from_dict(data)
+        else:
+            color_index = len(self.sections) % len(RECOMMENDED_COLORS)
+            model = Section(color=RECOMMENDED_COLORS[color_index], contents=[Content(), Content()])
+        self.document.sections.append(model)
+        self._create_section_widget(model)
+        self.mark_dirty()
+
+    def _create_section_widget(self, model):
+        with profiler.span("add_section"):
+            if self.virtual_editor:
+                section = RowSlot(self.sections_frame, model, _describe_section, VirtualSectionFrame.estimate_height(model))
+                self.request_viewport_refresh()
+            else:
+                section = SectionFrame(self.sections_frame, self.remove_section, model)
+            section.pack(fill="x", pady=(0, 15), expand=True, padx=5)
+            self.sections.append(section)
+        if profiler.enabled:
+            # 콘텐츠 위젯은 add_content에서 따로 센다
+            profiler.count("widgets", count_widgets(section, getattr(section, "contents_frame", None)))
+
+    def _rebind_section_widget(self, section, model):
+        if self.virtual_editor:
+            section.rebind(model, VirtualSectionFrame.estimate_height(model))
+            self.request_viewport_refresh()
+        else:
+            section.bind_model(model, defer_contents=True)
 
     def remove_section(self, section_to_remove):
+        self._finish_load()
+        if self.virtual_editor:
+            # 가상화 모드에서 self.sections는 RowSlot 목록이다
+            row = next(row for row in self.sections if row.frame is section_to_remove)
+            self._recycle_section(row)
+            section_to_remove = row
+            self.request_viewport_refresh()
         section_to_remove.destroy()
         self.sections.remove(section_to_remove)
+        self.document.sections.remove(section_to_remove.model)
+        self.mark_dirty()
+
+    def _recycle_section(self, row):
+        frame = row.frame
+        content_heights = sum(slot.winfo_height() + 10 for slot in frame.contents)
+        VirtualSectionFrame.chrome_height = max(0, row.winfo_height() - content_heights)
+        frame.release_contents()
+        self.section_pool.append(row.detach())
+
+    def request_viewport_refresh(self, event=None):
+        if not self._viewport_pending:
+            self._viewport_pending = True
+            self.root.after_idle(self._refresh_viewport)
+
+    def _refresh_viewport(self):
+        self._viewport_pending = False
+        self.root.update_idletasks()
+        top = self.canvas.winfo_rooty() - VIRTUAL_MARGIN_PX
+        bottom = self.canvas.winfo_rooty() + self.canvas.winfo_height() + VIRTUAL_MARGIN_PX
+
+        changed = False
+        for row in self.sections:
+            y = row.winfo_rooty()
+            visible = y + row.winfo_height() >= top and y <= bottom
+            if visible and row.frame is None:
+                frame = self.section_pool.pop() if self.section_pool else VirtualSectionFrame(self.sections_frame, self.remove_section, row.model, self.request_viewport_refresh)
+                row.attach(frame)
+                changed = True
+            elif not visible and row.frame is not None:
+                self._recycle_section(row)
+                changed = True
+        if changed:
+            self.root.update_idletasks()
+        for row in self.sections:
+            if row.frame is not None and row.frame.update_viewport(top, bottom):
+                changed = True
+        # 위젯을 붙이거나 떼면 행 높이가 바뀌므로 배치가 안정될 때까지 다시 확인
+        if changed:
+            self.request_viewport_refresh()
+
+    def _on_canvas_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.virtual_editor:
+            self.request_viewport_refresh()
+
+    def _on_canvas_configure(self, event):
+        self.canvas.itemconfig(self.canvas_window, width=event.width)
+        if self.virtual_editor:
+            self.request_viewport_refresh()
+
+    def mark_dirty(self, event=None):
+        now = time.monotonic()
+        if self.dirty_since is None:
+            self.dirty_since = now
+        self.last_edit = now
+        if self.preview is not None and self._preview_job is None:
+            self._preview_job = self.root.after(PREVIEW_DEBOUNCE_MS, self._publish_preview)
+
+    def _autosave_tick(self):
+        now = time.monotonic()
+        if self.dirty_since is not None and (now - self.last_edit >= AUTOSAVE_DEBOUNCE_SEC or now - self.dirty_since >= AUTOSAVE_MAX_DELAY_SEC):
+            self.dirty_since = None
+            self.autosave.submit(self.get_data())
+        self._report_autosave_error(self.autosave.pop_error())
+        self.root.after(AUTOSAVE_CHECK_MS, self._autosave_tick)
 
     def get_data(self):
-        return {
-            "header": {key: widget.get() for key, widget in self.header_widgets.items()},
-            "sections": [section.get_data() for section in self.sections]
-        }
+        with profiler.span("get_data"):
+            return self.document.to_dict()
 
     def save_data(self):
-        try:
-            with DATA_FILE.open('w', encoding='utf-8') as f:
-                json.dump(self.get_data(), f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            messagebox.showerror("자동 저장 오류", f"데이터 자동 저장 중 오류가 발생했습니다:\n{e}")
+        self.dirty_since = None
+        with profiler.span("save_data"):
+            self.autosave.submit(self.get_data())
+            error = self.autosave.flush()
+        self._report_autosave_error(error)
+
+    def _report_autosave_error(self, error):
+        if isinstance(error, SavedCallbackError):
+            # 파일은 저장되었고 작성 중 문서의 검색 색인만 실패했다
+            messagebox.showerror("검색 색인 오류", f"데이터는 저장되었지만 검색 색인을 갱신하지 못했습니다:\n{error.args[0]}")
+        elif error:
+            messagebox.showerror("자동 저장 오류", f"데이터 자동 저장 중 오류가 발생했습니다:\n{error}")
 
     def load_data(self):
         if not DATA_FILE.exists(): return
@@ -138,108 +310,204 @@ class App:
             if messagebox.askyesno("데이터 파일 오류", f"데이터 파일({DATA_FILE.name})을 불러오는 데 실패했습니다.\n백업 파일을 만드시겠습니까?"):
                 DATA_FILE.rename(f"{DATA_FILE}.bak_{uuid.uuid4().hex[:6]}")
 
-    def _populate_ui_from_data(self, data):
-        for section in self.sections: section.destroy()
-        self.sections.clear()
-        
+    def _populate_ui_from_data(self, data, on_loaded=None):
+        # 모델은 즉시 교체하고, 위젯은 기존 프레임을 재사용하며 after 콜백으로 나누어 맞춘다
+        self._cancel_load()
         header_data = data.get("header", {})
         for key, value in header_data.items():
-            if key in self.header_widgets:
-                self.header_widgets[key].delete(0, tk.END)
-                self.header_widgets[key].insert(0, value)
-        
-        for section_data in data.get("sections", []):
-            self.add_section(section_data)
+            if key in self.header_vars:
+                self.header_vars[key].set(value)
+
+        models = [Section.from_dict(section_data) for section_data in data.get("sections", [])]
+        self.document.sections = models
+        self.dirty_since = None
+
+        for section in self.sections[len(models):]:
+            if self.virtual_editor and section.frame is not None:
+                self._recycle_section(section)
+            section.destroy()
+        del self.sections[len(models):]
+
+        # 재사용하는 프레임은 지금 바로 새 모델에 연결해, 불러오는 동안의 편집이 버려질 모델에 쓰이지 않게 한다.
+        # 비용이 큰 ContentFrame 생성만 나누어 실행한다
+        reused = list(zip(self.sections, models))
+        for section, model in reused:
+            self._rebind_section_widget(section, model)
+        steps = [] if self.virtual_editor else [section.ensure_contents for section, model in reused if len(section.contents) < len(model.contents)]
+        steps += [lambda model=model: self._create_section_widget(model) for model in models[len(reused):]]
+        self._load_steps = iter(enumerate(steps, 1))
+        self._load_total = len(steps)
+        self._load_started = time.perf_counter()
+        self._load_callback = on_loaded
+        self.progress.config(maximum=max(1, len(steps)), value=0)
+        self.progress.pack(side="right", padx=5, pady=2)
+        self._run_load_steps()
 
-    def _sanitize_filename(self, name):
-        return re.sub(r'[\\/*?:"<>|]', "_", name).strip()
+    def _run_load_steps(self, budget=LOAD_SLICE_SEC):
+        self._load_job = None
+        deadline = time.perf_counter() + budget
+        for done, step in self._load_steps:
+            step()
+            if time.perf_counter() >= deadline:
+                self.progress.config(value=done)
+                self.set_status(f"불러오는 중... {done}/{self._load_total} 섹션")
+                self._load_job = self.root.after(1, self._run_load_steps)
+                return
+        self._load_steps = None
+        self.progress.pack_forget()
+        elapsed = time.perf_counter() - self._load_started
+        profiler.record("populate", elapsed, self._load_started)
+        self.set_status(f"시작 {self.startup_time:.2f}초  ·  불러오기 {self._load_total}개 섹션 {elapsed:.2f}초")
+        if self._load_callback:
+            self._load_callback()
+
+    def _finish_load(self):
+        if self._load_steps is not None:
+            if self._load_job:
+                self.root.after_cancel(self._load_job)
+            self._run_load_steps(budget=float("inf"))
+
+    def _cancel_load(self):
+        if self._load_job:
+            self.root.after_cancel(self._load_job)
+            self._load_job = None
+        self._load_steps = None
 
     def manual_save(self):
         try:
             data = self.get_data()
-            header = data.get("header", {})
-            main_title = self._sanitize_filename(header.get("main_title", "제목없음"))
-            issue_no = self._sanitize_filename(header.get("issue_no", "호수없음"))
-            issue_date = self._sanitize_filename(header.get("issue_date", "날짜없음"))
-            
-            base_filename = f"{main_title}_{issue_no}_{issue_date}"
-            json_path = BACKUP_DIR / f"{base_filename}.json"
-            html_path = BACKUP_DIR / f"{base_filename}.html"
-
-            with json_path.open('w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            
-            html_content = self.get_html_content(data)
-            with html_path.open('w', encoding='utf-8') as f:
-                f.write(html_content)
-                
-            messagebox.showinfo("백업 저장 완료", f"백업이 성공적으로 저장되었습니다.\n위치: {BACKUP_DIR}")
+            with profiler.span("backup_save"):
+                version_id = save_backup(self.backup_store, self.search_index, data)
+            messagebox.showinfo("백업 저장 완료", f"백업이 성공적으로 저장되었습니다. (버전 #{version_id})\n위치: {BACKUP_DIR}")
         except Exception as e:
             messagebox.showerror("백업 저장 오류", f"백업 파일 저장 중 오류가 발생했습니다:\n{e}")
 
     def manual_load(self):
+        BackupBrowser(self)
+
+    def load_backup_version(self, version_id, reveal_section=None):
+        try:
+            data = self.backup_store.load(version_id)
+        except Exception as e:
+            messagebox.showerror("오류", f"백업을 불러오는 중 오류가 발생했습니다: {e}")
+            return
+        if reveal_section is None:
+            self._populate_ui_from_data(data, on_loaded=lambda: messagebox.showinfo("성공", f"백업 버전 #{version_id}을(를) 성공적으로 불러왔습니다."))
+        else:
+            self._populate_ui_from_data(data, on_loaded=lambda: self.reveal_section(reveal_section))
+
+    def reveal_section(self, index):
+        if not 0 <= index < len(self.sections):
+            return
+        self.root.update_idletasks()
+        total_height = self.scrollable_frame.winfo_height()
+        if total_height > 0:
+            self.canvas.yview_moveto((self.sections_frame.winfo_y() + self.sections[index].winfo_y()) / total_height)
+
+    def _index_working_copy(self, data):
+        # 자동 저장 스레드에서 호출된다
+        self.search_index.index_document(WORKING_DOC_ID, data)
+
+    def load_backup_file(self):
+        from tkinter import filedialog
         filepath = filedialog.askopenfilename(initialdir=BACKUP_DIR, title="백업 파일 선택", filetypes=(("JSON 파일", "*.json"), ("모든 파일", "*.*")))
         if not filepath or not messagebox.askyesno("불러오기 확인", "현재 작업 내용이 사라집니다. 정말로 불러오시겠습니까?"):
             return
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            self._populate_ui_from_data(data)
-            messagebox.showinfo("성공", "백업 파일을 성공적으로 불러왔습니다.")
+            self._populate_ui_from_data(data, on_loaded=lambda: messagebox.showinfo("성공", "백업 파일을 성공적으로 불러왔습니다."))
         except Exception as e:
             messagebox.showerror("오류", f"파일을 불러오는 중 오류가 발생했습니다: {e}")
 
     def get_html_content(self, data):
         try:
-            header = data.get("header", {})
-            html_title = f"{header.get('main_title', '')}_{header.get('issue_no', '')}_{header.get('issue_date', '')}"
-            
-            sections_html_parts = []
-            for section_data in data.get("sections", []):
-                contents_html_parts = []
-                for content_data in section_data.get("contents", []):
-                    font_weight = "bold" if content_data.get("is_bold") else "normal"
-                    section_color = section_data.get("color", COLOR_INFO)
-                    color = content_data.get("color") or section_color
-                    
-                    title_text = content_data.get("title") or "&nbsp;"
-                    body_text = (content_data.get("body") or "").replace('\n', '<br>')
-                    link_url = content_data.get("link")
-
-                    if link_url:
-                        link_html = f'<p style="margin-top:15px;text-align:right;font-size:0.9em;"><a href="{link_url}" target="_blank" style="color:{color};font-weight:500;text-decoration:none;border-bottom:1px solid {color};padding-bottom:2px;">바로가기 링크 &rarr;</a></p>'
-                        body_text += link_html
-                    
-                    contents_html_parts.append(CONTENT_TEMPLATE.format(content_title=title_text, content_body=body_text, color=color, font_weight=font_weight))
-                
-                sections_html_parts.append(SECTION_TEMPLATE.format(
-                    sidebar_title=section_data.get("sidebar_title", ""),
-                    section_title=section_data.get("title") or "&nbsp;",
-                    color=section_data.get("color", COLOR_INFO),
-                    contents_html="".join(contents_html_parts)
-                ))
-
-            return HTML_TEMPLATE.format(
-                html_title=html_title,
-                main_title=header.get("main_title", ""),
-                issue_no=header.get("issue_no", ""),
-                issue_date=header.get("issue_date", ""),
-                sections_html="".join(sections_html_parts)
-            )
+            with profiler.span("render_html"):
+                return render_html(data, self.render_cache)
         except Exception as e:
             messagebox.showerror("HTML 생성 오류", f"HTML 생성 중 오류가 발생했습니다:\n{e}")
             return "<html><body><h1>HTML 생성 오류</h1></body></html>"
 
     def generate_html(self):
         self.save_data()
-        final_html = self.get_html_content(self.get_data())
-        with OUTPUT_FILE.open('w', encoding='utf-8') as f:
-            f.write(final_html)
+        try:
+            data = self.get_data()
+            with profiler.span("write_html"):
+                if self.optimize_output.get():
+                    stats = write_optimized_html(data, OUTPUT_FILE, self.render_cache)
+                    written = stats.bytes_after
+                    self.set_status(f"최적화 출력: {describe_stats(stats)}")
+                else:
+                    written = write_html(data, OUTPUT_FILE, self.render_cache)
+            profiler.count("bytes:newsletter.html", written)
+        except Exception as e:
+            messagebox.showerror("HTML 생성 오류", f"HTML 생성 중 오류가 발생했습니다:\n{e}")
+            return
         messagebox.showinfo("성공", "HTML 파일이 성공적으로 생성되었습니다.")
+        import webbrowser
         webbrowser.open_new_tab(OUTPUT_FILE.resolve().as_uri())
 
+    def export_offline(self):
+        from tkinter import filedialog
+        from newsletter_export import describe_stats as describe_export, export_offline
+        filepath = filedialog.asksaveasfilename(parent=self.root, title="오프라인 HTML로 내보내기", initialdir=CWD, initialfile="newsletter_offline.html", defaultextension=".html", filetypes=(("HTML 파일", "*.html"),))
+        if not filepath:
+            return
+        self.save_data()
+        self.set_status("오프라인 HTML 내보내는 중...")
+        try:
+            stats = export_offline(self.get_data(), filepath, CWD, render_cache=self.render_cache, optimize=self.optimize_output.get())
+        except Exception as e:
+            messagebox.showerror("내보내기 오류", f"오프라인 HTML 내보내기 중 오류가 발생했습니다:\n{e}")
+            self.set_status("오프라인 내보내기 실패")
+            return
+        self.set_status(f"오프라인 내보내기 완료: {describe_export(stats)}")
+
+    def open_preview(self):
+        # 서버는 한 번만 띄우고, 연결된 탭이 없을 때만 새 탭을 연다
+        if self.preview is None:
+            from newsletter_preview import PreviewServer
+            try:
+                self.preview = PreviewServer(cache=self.render_cache).start()
+            except OSError as e:
+                messagebox.showerror("미리보기 오류", f"미리보기 서버를 시작하지 못했습니다:\n{e}")
+                return
+        self._publish_preview()
+        if not self.preview.has_clients:
+            import webbrowser
+            webbrowser.open_new_tab(self.preview.url)
+        self.set_status(f"실시간 미리보기: {self.preview.url}")
+
+    def _publish_preview(self):
+        self._preview_job = None
+        try:
+            self.preview.publish(self.get_data())
+        except Exception as e:
+            self.set_status(f"미리보기 갱신 실패: {e}")
+
+    def toggle_profiling(self):
+        profiler.set_enabled(self.profile_enabled.get())
+        if profiler.enabled:
+            self.open_profile_panel()
+
+    def open_profile_panel(self):
+        if self.profile_panel is not None and self.profile_panel.winfo_exists():
+            self.profile_panel.lift()
+            return
+        self.profile_panel = ProfilePanel(self)
+
     def on_closing(self):
+        self._cancel_load()
+        if self._preview_job:
+            self.root.after_cancel(self._preview_job)
+        if self.preview is not None:
+            self.preview.close()
         self.save_data()
+        self.autosave.close()
+        self.render_cache.close()
+        self.backup_store.close()
+        self.search_index.close()
+        profiler.close_log()
         self.root.destroy()
         
     def _on_mousewheel(self, event):
@@ -252,11 +520,13 @@ class App:
 # 섹션 프레임 클래스
 # =================================================================================
 class SectionFrame(tk.LabelFrame):
-    def __init__(self, parent, remove_callback, data=None, initial_color=None):
+    def __init__(self, parent, remove_callback, model):
         super().__init__(parent, text="섹션 정보", padx=15, pady=15, bd=1, relief="solid")
         self.id = str(uuid.uuid4())
         self.remove_callback = remove_callback
+        self.model = None
         self.contents = []
+        self._syncing = False
         
         top_frame = Frame(self)
         top_frame.pack(fill="x", pady=(0, 10))
@@ -265,131 +535,208 @@ class SectionFrame(tk.LabelFrame):
         fields_frame = Frame(self)
         fields_frame.pack(fill="x")
         
+        self.sidebar_title_var = tk.StringVar()
+        self.title_var = tk.StringVar()
+        self.color_var = tk.StringVar()
+
         tk.Label(fields_frame, text="세로 제목:").grid(row=0, column=0, sticky="w")
-        self.sidebar_title_entry = tk.Entry(fields_frame)
+        self.sidebar_title_entry = tk.Entry(fields_frame, textvariable=self.sidebar_title_var)
         self.sidebar_title_entry.grid(row=0, column=1, columnspan=2, sticky="ew")
         
         tk.Label(fields_frame, text="가로 제목:").grid(row=1, column=0, sticky="w", pady=(5,0))
-        self.title_entry = tk.Entry(fields_frame)
+        self.title_entry = tk.Entry(fields_frame, textvariable=self.title_var)
         self.title_entry.grid(row=1, column=1, columnspan=2, sticky="ew", pady=(5,0))
         
         tk.Label(fields_frame, text="색상 코드:").grid(row=2, column=0, sticky="w", pady=(5,0))
-        self.color_entry = tk.Entry(fields_frame, width=10)
+        self.color_entry = tk.Entry(fields_frame, width=10, textvariable=self.color_var)
         self.color_entry.grid(row=2, column=1, sticky="w", pady=(5,0))
         
         self.color_preview = Canvas(fields_frame, width=22, height=22, relief="sunken", bd=1)
         self.color_preview.grid(row=2, column=2, sticky="w", padx=5, pady=(5,0))
-        self.color_entry.bind("<KeyRelease>", self._update_color_preview)
         self.color_preview.bind("<Button-1>", self.choose_color)
         
         fields_frame.columnconfigure(1, weight=1)
+
+        for field, var in (("sidebar_title", self.sidebar_title_var), ("title", self.title_var), ("color", self.color_var)):
+            var.trace_add("write", lambda *_, field=field, var=var: self._on_field_change(field, var))
         
         self.contents_frame = Frame(self)
         self.contents_frame.pack(fill="x", pady=10)
         tk.Button(self, text="콘텐츠 추가 (+)", command=lambda: self.add_content()).pack(pady=5)
         
-        if data:
-            self.load_data(data)
-        else:
-            self.color_entry.insert(0, initial_color or "#74438d")
-            self.add_content()
-            self.add_content()
+        self.bind_model(model)
+
+    def bind_model(self, model, defer_contents=False):
+        # 변수 값을 채우는 동안에는 trace가 모델을 건드리거나 변경 이벤트를 내지 않도록 막는다
+        self.model = model
+        self._syncing = True
+        try:
+            self.sidebar_title_var.set(model.sidebar_title)
+            self.title_var.set(model.title)
+            self.color_var.set(model.color)
+        finally:
+            self._syncing = False
+        self._load_contents(create=not defer_contents)
         self._update_color_preview()
 
+    def _load_contents(self, create=True):
+        # 기존 ContentFrame은 새 모델에 다시 연결하고 남는 것은 지운다. 모자란 것은 create일 때만 바로 만든다
+        models = self.model.contents
+        reused = min(len(self.contents), len(models))
+        for content, content_model in zip(self.contents, models):
+            content.bind_model(content_model)
+        for content in self.contents[reused:]: content.destroy()
+        del self.contents[reused:]
+        if create:
+            self.ensure_contents()
+
+    def ensure_contents(self):
+        # 프레임은 항상 모델 목록의 앞부분과 짝을 이루므로, 뒤쪽의 아직 프레임이 없는 모델만 만든다
+        for content_model in self.model.contents[len(self.contents):]:
+            self._create_content_frame(content_model)
+
+    def _on_field_change(self, field, var):
+        if self._syncing:
+            return
+        setattr(self.model, field, var.get())
+        if field == "color":
+            self._update_color_preview()
+        self.event_generate(MODIFIED_EVENT)
+
     def choose_color(self, event=None):
-        _, color_hex = colorchooser.askcolor(title="색상 선택", initialcolor=self.color_entry.get())
+        from tkinter import colorchooser
+        _, color_hex = colorchooser.askcolor(title="색상 선택", initialcolor=self.model.color)
         if color_hex:
-            self.color_entry.delete(0, tk.END)
-            self.color_entry.insert(0, color_hex)
-            self._update_color_preview()
+            self.color_var.set(color_hex)
 
     def _update_color_preview(self, event=None):
         try:
-            self.color_preview.config(bg=self.color_entry.get())
+            self.color_preview.config(bg=self.model.color)
         except tk.TclError:
             self.color_preview.config(bg="white")
 
-    def add_content(self, data=None):
-        content = ContentFrame(self.contents_frame, self.remove_content, data)
-        content.pack(fill="x", pady=5, expand=True)
-        self.contents.append(content)
+    def _create_content_frame(self, content_model):
+        with profiler.span("add_content"):
+            content = ContentFrame(self.contents_frame, self.remove_content, content_model)
+            content.pack(fill="x", pady=5, expand=True)
+            self.contents.append(content)
+        if profiler.enabled:
+            profiler.count("widgets", count_widgets(content))
+        return content
+
+    def add_content(self):
+        self.ensure_contents()
+        content_model = Content()
+        self.model.contents.append(content_model)
+        self._create_content_frame(content_model)
+        self.event_generate(MODIFIED_EVENT)
 
     def remove_content(self, content_to_remove):
         content_to_remove.destroy()
         self.contents.remove(content_to_remove)
+        self.model.contents.remove(content_to_remove.model)
+        self.event_generate(MODIFIED_EVENT)
 
     def destroy_frame(self):
         if messagebox.askyesno("삭제 확인", "이 섹션을 정말 삭제하시겠습니까?"):
             self.remove_callback(self)
 
     def get_data(self):
-        return {
-            "sidebar_title": self.sidebar_title_entry.get(),
-            "title": self.title_entry.get(),
-            "color": self.color_entry.get(),
-            "contents": [content.get_data() for content in self.contents]
-        }
-
-    def load_data(self, data):
-        self.sidebar_title_entry.insert(0, data.get("sidebar_title", ""))
-        self.title_entry.insert(0, data.get("title", ""))
-        self.color_entry.insert(0, data.get("color", "#FFFFFF"))
-        for content_data in data.get("contents", []):
-            self.add_content(content_data)
+        return self.model.to_dict()
 
 # =================================================================================
 # 콘텐츠 프레임 클래스
 # =================================================================================
 class ContentFrame(tk.LabelFrame):
-    def __init__(self, parent_frame, remove_callback, data=None):
+    def __init__(self, parent_frame, remove_callback, model):
         super().__init__(parent_frame, text="콘텐츠", padx=10, pady=10, bd=1, relief="solid")
         self.parent_section = self.master.master
         self.id = str(uuid.uuid4())
         self.remove_callback = remove_callback
+        self.model = None
+        self._syncing = False
+
+        self.title_var = tk.StringVar()
+        self.link_var = tk.StringVar()
+        self.color_var = tk.StringVar()
+        self.is_bold = tk.BooleanVar()
         
         tk.Label(self, text="제목:").grid(row=0, column=0, sticky="w", pady=2)
-        self.title_entry = tk.Entry(self)
+        self.title_entry = tk.Entry(self, textvariable=self.title_var)
         self.title_entry.grid(row=0, column=1, columnspan=4, sticky="ew")
 
         tk.Label(self, text="내용:").grid(row=1, column=0, sticky="nw", pady=2)
         self.body_text = scrolledtext.ScrolledText(self, height=4, wrap=tk.WORD)
         self.body_text.grid(row=1, column=1, columnspan=4, sticky="ew")
+        self.body_text.bind("<<Modified>>", self._on_body_modified)
         self.body_text.bind("<Tab>", lambda e: self.link_entry.focus_set() or "break")
         self.body_text.bind("<Shift-Tab>", lambda e: self.title_entry.focus_set() or "break")
 
         tk.Label(self, text="링크:").grid(row=2, column=0, sticky="w", pady=2)
-        self.link_entry = tk.Entry(self)
+        self.link_entry = tk.Entry(self, textvariable=self.link_var)
         self.link_entry.grid(row=2, column=1, columnspan=4, sticky="ew")
 
-        self.is_bold = tk.BooleanVar()
         tk.Checkbutton(self, text="굵게", variable=self.is_bold).grid(row=3, column=1, sticky="w")
         
         tk.Label(self, text="색상:").grid(row=3, column=2, sticky="e", padx=(10,0))
-        self.color_entry = tk.Entry(self, width=10)
+        self.color_entry = tk.Entry(self, width=10, textvariable=self.color_var)
         self.color_entry.grid(row=3, column=3, sticky="w")
         
         self.color_preview = Canvas(self, width=22, height=22, relief="sunken", bd=1)
         self.color_preview.grid(row=3, column=4, sticky="w", padx=5)
-        self.color_entry.bind("<KeyRelease>", self._update_color_preview)
         self.color_preview.bind("<Button-1>", self.choose_color)
         
         delete_button = tk.Button(self, text="이 콘텐츠 삭제", command=self.destroy_frame, bg=COLOR_INFO, fg="white")
         delete_button.grid(row=4, column=0, columnspan=5, pady=(10,0), sticky="e")
         
         self.columnconfigure(1, weight=1)
-        if data: self.load_data(data)
+        for field, var in (("title", self.title_var), ("link", self.link_var), ("color", self.color_var), ("is_bold", self.is_bold)):
+            var.trace_add("write", lambda *_, field=field, var=var: self._on_field_change(field, var))
+        self.bind_model(model)
+
+    def bind_model(self, model):
+        if self.model is not None:
+            # 재사용되기 전에 아직 처리되지 않은 본문 변경을 이전 모델에 반영
+            self._on_body_modified()
+        self.model = model
+        self._syncing = True
+        try:
+            self.title_var.set(model.title)
+            self.link_var.set(model.link)
+            self.color_var.set(model.color)
+            self.is_bold.set(model.is_bold)
+            self.body_text.delete("1.0", tk.END)
+            self.body_text.insert("1.0", model.body)
+            self.body_text.edit_modified(False)
+        finally:
+            self._syncing = False
         self._update_color_preview()
 
+    def _on_field_change(self, field, var):
+        if self._syncing:
+            return
+        setattr(self.model, field, var.get())
+        if field == "color":
+            self._update_color_preview()
+        self.event_generate(MODIFIED_EVENT)
+
+    def _on_body_modified(self, event=None):
+        # 플래그를 되돌릴 때도 <<Modified>>가 발생하므로 실제 변경일 때만 반영
+        if not self.body_text.edit_modified():
+            return
+        self.model.body = self.body_text.get("1.0", tk.END).strip()
+        self.body_text.edit_modified(False)
+        self.event_generate(MODIFIED_EVENT)
+
     def choose_color(self, event=None):
-        current_color = self.color_entry.get() or self.parent_section.color_entry.get()
+        current_color = self.model.color or self.parent_section.model.color
+        from tkinter import colorchooser
         _, color_hex = colorchooser.askcolor(title="색상 선택", initialcolor=current_color)
         if color_hex:
-            self.color_entry.delete(0, tk.END)
-            self.color_entry.insert(0, color_hex)
-            self._update_color_preview()
+            self.color_var.set(color_hex)
 
     def _update_color_preview(self, event=None):
-        color_code = self.color_entry.get() or self.parent_section.color_entry.get()
+        color_code = self.model.color or self.parent_section.model.color
         try:
             self.color_preview.config(bg=color_code)
         except tk.TclError:
@@ -400,20 +747,329 @@ class ContentFrame(tk.LabelFrame):
             self.remove_callback(self)
 
     def get_data(self):
-        return {
-            "title": self.title_entry.get(),
-            "body": self.body_text.get("1.0", tk.END).strip(),
-            "link": self.link_entry.get(),
-            "is_bold": self.is_bold.get(),
-            "color": self.color_entry.get()
-        }
-
-    def load_data(self, data):
-        self.title_entry.insert(0, data.get("title", ""))
-        self.body_text.insert("1.0", data.get("body", ""))
-        self.link_entry.insert(0, data.get("link", ""))
-        self.is_bold.set(data.get("is_bold", False))
-        self.color_entry.insert(0, data.get("color", ""))
+        return self.model.to_dict()
+
+# =================================================================================
+# 백업 목록 창
+# =================================================================================
+class BackupBrowser(tk.Toplevel):
+    COLUMNS = (("saved_at", "저장 시각", 150), ("main_title", "제목", 200), ("issue_no", "호수", 60), ("issue_date", "발행 날짜", 100), ("sections", "섹션", 50))
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.app = app
+        self.title("백업 불러오기")
+        self.geometry("700x450")
+        self.transient(app.root)
+
+        filter_frame = Frame(self)
+        filter_frame.pack(fill="x", padx=10, pady=(10, 5))
+        tk.Label(filter_frame, text="검색:").pack(side="left")
+        self.filter_var = tk.StringVar()
+        tk.Entry(filter_frame, textvariable=self.filter_var).pack(side="left", fill="x", expand=True, padx=5)
+        self.filter_var.trace_add("write", lambda *_: self.refresh())
+
+        list_frame = Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=10)
+        self.tree = ttk.Treeview(list_frame, columns=[column for column, _, _ in self.COLUMNS], show="headings", selectmode="browse")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+        scrollbar = Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<Double-1>", lambda e: self.load_selected())
+
+        button_frame = Frame(self)
+        button_frame.pack(fill="x", padx=10, pady=10)
+        tk.Button(button_frame, text="불러오기", command=self.load_selected, bg=COLOR_PRIMARY, fg="white").pack(side="left")
+        tk.Button(button_frame, text="HTML로 내보내기", command=self.export_selected).pack(side="left", padx=5)
+        tk.Button(button_frame, text="파일에서 불러오기...", command=self.load_file).pack(side="left")
+        tk.Button(button_frame, text="닫기", command=self.destroy).pack(side="right")
+
+        self.versions = app.backup_store.list_versions()
+        self.refresh()
+
+    def refresh(self):
+        needle = self.filter_var.get().strip()
+        self.tree.delete(*self.tree.get_children())
+        for version in self.versions:
+            if needle and needle not in f"{version.main_title} {version.issue_no} {version.issue_date}":
+                continue
+            self.tree.insert("", "end", iid=str(version.id), values=(format_time(version.saved_at), version.main_title, version.issue_no, version.issue_date, version.section_count))
+
+    def _selected_version(self):
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def load_selected(self):
+        version_id = self._selected_version()
+        if version_id is None or not messagebox.askyesno("불러오기 확인", "현재 작업 내용이 사라집니다. 정말로 불러오시겠습니까?", parent=self):
+            return
+        self.destroy()
+        self.app.load_backup_version(version_id)
+
+    def export_selected(self):
+        from tkinter import filedialog
+        version_id = self._selected_version()
+        if version_id is None:
+            return
+        filepath = filedialog.asksaveasfilename(parent=self, title="HTML로 내보내기", defaultextension=".html", filetypes=(("HTML 파일", "*.html"),))
+        if not filepath:
+            return
+        try:
+            self.app.backup_store.render(version_id, filepath, self.app.render_cache)
+            messagebox.showinfo("성공", "HTML 파일이 성공적으로 생성되었습니다.", parent=self)
+        except Exception as e:
+            messagebox.showerror("HTML 생성 오류", f"HTML 생성 중 오류가 발생했습니다:\n{e}", parent=self)
+
+    def load_file(self):
+        self.destroy()
+        self.app.load_backup_file()
+
+# =================================================================================
+# 검색 창
+# =================================================================================
+class SearchDialog(tk.Toplevel):
+    COLUMNS = (("issue", "호", 220), ("location", "위치", 130), ("snippet", "내용", 330))
+    SEARCH_DELAY_MS = 200
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.app = app
+        self.title("전체 검색")
+        self.geometry("720x450")
+        self.transient(app.root)
+        self.hits = {}
+        self._search_job = None
+
+        query_frame = Frame(self)
+        query_frame.pack(fill="x", padx=10, pady=(10, 5))
+        tk.Label(query_frame, text="검색어:").pack(side="left")
+        self.query_var = tk.StringVar()
+        entry = tk.Entry(query_frame, textvariable=self.query_var)
+        entry.pack(side="left", fill="x", expand=True, padx=5)
+        entry.focus_set()
+        self.query_var.trace_add("write", lambda *_: self._schedule_search())
+        self.status_label = tk.Label(query_frame, fg=COLOR_INFO)
+        self.status_label.pack(side="right")
+
+        list_frame = Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(list_frame, columns=[column for column, _, _ in self.COLUMNS], show="headings", selectmode="browse")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+        scrollbar = Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+        self.tree.bind("<Return>", lambda e: self.open_selected())
+
+    def _schedule_search(self):
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self.search)
+
+    def search(self):
+        self._search_job = None
+        started = time.perf_counter()
+        try:
+            hits = self.app.search_index.search(self.query_var.get())
+        except Exception as e:
+            self.status_label.config(text=f"검색 오류: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.tree.delete(*self.tree.get_children())
+        self.hits = {}
+        for number, hit in enumerate(hits):
+            iid = str(number)
+            self.hits[iid] = hit
+            issue = f"{hit.main_title} 제 {hit.issue_no}호 {hit.issue_date}"
+            if hit.doc_id == WORKING_DOC_ID:
+                issue += " (작성 중)"
+            self.tree.insert("", "end", iid=iid, values=(issue, describe_location(hit), hit.snippet.replace("\n", " ")))
+        self.status_label.config(text=f"{len(hits)}건 · {elapsed_ms:.0f}ms")
+
+    def open_selected(self):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        hit = self.hits[selection[0]]
+        section_index = max(hit.section_index, 0)
+        if hit.doc_id == WORKING_DOC_ID or hit.version_id is None:
+            self.app.reveal_section(section_index)
+            return
+        if not messagebox.askyesno("불러오기 확인", "현재 작업 내용이 사라집니다. 정말로 불러오시겠습니까?", parent=self):
+            return
+        self.app.load_backup_version(hit.version_id, reveal_section=section_index)
+
+# =================================================================================
+# 성능 통계 창
+# =================================================================================
+class ProfilePanel(tk.Toplevel):
+    COLUMNS = (("name", "항목", 180), ("count", "횟수", 70), ("total", "누적 ms", 90), ("mean", "평균 ms", 90), ("max", "최대 ms", 90), ("last", "마지막 ms", 90))
+    REFRESH_MS = 500
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.app = app
+        self.title("성능 통계")
+        self.geometry("640x360")
+
+        top_frame = Frame(self)
+        top_frame.pack(fill="x", padx=10, pady=(10, 5))
+        tk.Checkbutton(top_frame, text="계측 사용", variable=app.profile_enabled, command=app.toggle_profiling).pack(side="left")
+        tk.Button(top_frame, text="초기화", command=profiler.reset).pack(side="right")
+        self.counters_label = tk.Label(self, anchor="w", justify="left", fg=COLOR_INFO)
+        self.counters_label.pack(fill="x", padx=10)
+
+        self.tree = ttk.Treeview(self, columns=[column for column, _, _ in self.COLUMNS], show="headings")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w" if column == "name" else "e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+        self._refresh_job = None
+        # 창 관리자의 닫기 버튼도 파이썬 destroy()를 거치게 하고, Tcl 수준에서 파괴되어도 타이머를 취소한다
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.bind("<Destroy>", self._on_destroy)
+        self.refresh()
+
+    def refresh(self):
+        self._refresh_job = None
+        if not self.winfo_exists():
+            return
+        self._refresh_job = self.after(self.REFRESH_MS, self.refresh)
+        if not profiler.enabled:
+            self.counters_label.config(text="계측이 꺼져 있습니다. (도구 > 성능 계측)")
+            return
+        timings, counters = profiler.snapshot()
+        self.tree.delete(*self.tree.get_children())
+        for name, count, total, longest, last in timings:
+            self.tree.insert("", "end", values=(name, count, f"{total * 1000:.1f}", f"{total * 1000 / count:.2f}", f"{longest * 1000:.2f}", f"{last * 1000:.2f}"))
+        self.counters_label.config(text="  ·  ".join(f"{name}: {value:,}" for name, value in sorted(counters.items())))
+
+    def _on_destroy(self, event):
+        # 툴플레벨 바인딩은 자식 위젯의 <Destroy>에도 불리므로 창 자신일 때만 처리한다
+        if event.widget is self:
+            self._cancel_refresh()
+
+    def _cancel_refresh(self):
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+
+    def destroy(self):
+        # 창을 닫은 뒤 예약된 refresh가 삭제된 Tcl 명령을 부르지 않도록 취소한다
+        self._cancel_refresh()
+        super().destroy()
+
+# =================================================================================
+# 가상화 편집기
+# =================================================================================
+def _describe_section(model):
+    return f"▸ {model.sidebar_title or '-'} / {model.title or '(제목 없음)'}  ·  콘텐츠 {len(model.contents)}개"
+
+def _describe_content(model):
+    first_line = model.body.splitlines()[0] if model.body else "(빈 콘텐츠)"
+    return f"▸ {model.title or first_line}"
+
+class RowSlot(Frame):
+    # 가상화 편집기의 한 행. 편집 프레임이 붙어 있지 않을 때는 같은 높이의 요약 행을 보여준다
+    def __init__(self, parent, model, describe, height):
+        super().__init__(parent, height=height)
+        self.model = model
+        self.describe = describe
+        self.frame = None
+        self.pack_propagate(False)
+        self.summary = tk.Label(self, text=describe(model), anchor="w", fg=COLOR_INFO, bd=1, relief="groove", padx=10)
+        self.summary.pack(fill="both", expand=True)
+
+    def attach(self, frame):
+        if frame.model is not self.model:
+            frame.bind_model(self.model)
+        self.summary.pack_forget()
+        frame.pack(in_=self, fill="x")
+        frame.lift()
+        self.pack_propagate(True)
+        self.frame = frame
+
+    def rebind(self, model, height):
+        self.model = model
+        if self.frame is not None:
+            self.frame.bind_model(model)
+        else:
+            self.config(height=height)
+            self.summary.config(text=self.describe(model))
+
+    def detach(self):
+        frame, self.frame = self.frame, None
+        self.config(height=self.winfo_height())
+        self.pack_propagate(False)
+        frame.pack_forget()
+        self.summary.config(text=self.describe(self.model))
+        self.summary.pack(fill="both", expand=True)
+        return frame
+
+class VirtualSectionFrame(SectionFrame):
+    # 화면 근처의 콘텐츠만 ContentFrame을 붙이고, 화면을 벗어난 ContentFrame은 이 섹션 안에서 재사용한다
+    content_height = 190
+    chrome_height = 170
+
+    def __init__(self, parent, remove_callback, model, layout_callback):
+        self.layout_callback = layout_callback
+        self.content_pool = []
+        super().__init__(parent, remove_callback, model)
+
+    @classmethod
+    def estimate_height(cls, model):
+        return cls.chrome_height + len(model.contents) * (cls.content_height + 10)
+
+    def _load_contents(self, create=True):
+        # 요약 행은 가벼우므로 지연 없이 모두 만든다
+        self.release_contents()
+        for slot in self.contents: slot.destroy()
+        self.contents.clear()
+        for content_model in self.model.contents:
+            self._create_content_frame(content_model)
+
+    def _create_content_frame(self, content_model):
+        slot = RowSlot(self.contents_frame, content_model, _describe_content, VirtualSectionFrame.content_height)
+        slot.pack(fill="x", pady=5)
+        self.contents.append(slot)
+        self.layout_callback()
+        return slot
+
+    def remove_content(self, content_to_remove):
+        slot = next(slot for slot in self.contents if slot.frame is content_to_remove)
+        self.content_pool.append(slot.detach())
+        slot.destroy()
+        self.contents.remove(slot)
+        self.model.contents.remove(slot.model)
+        self.event_generate(MODIFIED_EVENT)
+        self.layout_callback()
+
+    def release_contents(self):
+        for slot in self.contents:
+            if slot.frame is not None:
+                self.content_pool.append(slot.detach())
+
+    def update_viewport(self, top, bottom):
+        changed = False
+        for slot in self.contents:
+            y = slot.winfo_rooty()
+            visible = y + slot.winfo_height() >= top and y <= bottom
+            if visible and slot.frame is None:
+                frame = self.content_pool.pop() if self.content_pool else ContentFrame(self.contents_frame, self.remove_content, slot.model)
+                slot.attach(frame)
+                changed = True
+            elif not visible and slot.frame is not None:
+                VirtualSectionFrame.content_height = slot.winfo_height()
+                self.content_pool.append(slot.detach())
+                changed = True
+        return changed
 
 # =================================================================================
 # 애플리케이션 실행
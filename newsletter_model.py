@@ -0,0 +1,78 @@
+# =================================================================================
+# 문서 모델
+# =================================================================================
+# 위젯 변경 이벤트로 갱신되는 메모리상의 문서. 저장·렌더링·백업은 Tk 위젯 대신 이 모델을 읽는다.
+# to_dict()는 newsletter_data.json 형식과 같다.
+
+class Header:
+    __slots__ = ("main_title", "issue_no", "issue_date")
+    FIELDS = __slots__
+
+    def __init__(self, main_title="", issue_no="", issue_date=""):
+        self.main_title = main_title
+        self.issue_no = issue_no
+        self.issue_date = issue_date
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data.get(key, "") for key in cls.FIELDS})
+
+    def to_dict(self):
+        return {"main_title": self.main_title, "issue_no": self.issue_no, "issue_date": self.issue_date}
+
+class Content:
+    __slots__ = ("title", "body", "link", "is_bold", "color")
+
+    def __init__(self, title="", body="", link="", is_bold=False, color=""):
+        self.title = title
+        self.body = body
+        self.link = link
+        self.is_bold = is_bold
+        self.color = color
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("title", ""), data.get("body", ""), data.get("link", ""), bool(data.get("is_bold", False)), data.get("color", ""))
+
+    def to_dict(self):
+        return {"title": self.title, "body": self.body, "link": self.link, "is_bold": self.is_bold, "color": self.color}
+
+class Section:
+    __slots__ = ("sidebar_title", "title", "color", "contents")
+
+    def __init__(self, sidebar_title="", title="", color="", contents=None):
+        self.sidebar_title = sidebar_title
+        self.title = title
+        self.color = color
+        self.contents = contents if contents is not None else []
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("sidebar_title", ""),
+            data.get("title", ""),
+            data.get("color", "#FFFFFF"),
+            [Content.from_dict(content_data) for content_data in data.get("contents", [])]
+        )
+
+    def to_dict(self):
+        return {
+            "sidebar_title": self.sidebar_title,
+            "title": self.title,
+            "color": self.color,
+            "contents": [content.to_dict() for content in self.contents]
+        }
+
+class Document:
+    __slots__ = ("header", "sections")
+
+    def __init__(self, header=None, sections=None):
+        self.header = header if header is not None else Header()
+        self.sections = sections if sections is not None else []
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(Header.from_dict(data.get("header", {})), [Section.from_dict(section_data) for section_data in data.get("sections", [])])
+
+    def to_dict(self):
+        return {"header": self.header.to_dict(), "sections": [section.to_dict() for section in self.sections]}
@@ -0,0 +1,113 @@
+import re
+from collections import namedtuple
+
+from newsletter_render import atomic_output, render_html
+
+# =================================================================================
+# 출력 크기 최적화
+# =================================================================================
+# 렌더러가 만든 HTML만 대상으로 한다. 사용자 텍스트는 이미 이스케이프되어 있으므로
+# 시작 태그와 style 속성을 정규식으로 안전하게 찾을 수 있다.
+OptimizeStats = namedtuple("OptimizeStats", "bytes_before bytes_after class_count")
+
+_START_TAG_RE = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*)>")
+_STYLE_ATTR_RE = re.compile(r'\sstyle="([^"]*)"')
+_CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+_STYLE_BLOCK_RE = re.compile(r"<style>(.*?)</style>", re.S)
+_TAG_GAP_RE = re.compile(r">\s*\n\s*<")
+_SELECTOR_SPACE_RE = re.compile(r"\s*([,>+~])\s*")
+_DECLARATION_SPACE_RE = re.compile(r"\s*([;:,])\s*")
+
+def _normalize_declarations(style):
+    return ";".join(declaration.strip() for declaration in style.split(";") if declaration.strip())
+
+def _parse_css(css, start=0):
+    # (prelude, body) 목록을 돌려준다. @media 같은 블록은 body가 다시 목록이다
+    blocks, i = [], start
+    while i < len(css):
+        if css[i] == "}":
+            return blocks, i + 1
+        brace = css.find("{", i)
+        if brace < 0:
+            break
+        prelude = css[i:brace].strip()
+        if prelude.startswith("@"):
+            body, i = _parse_css(css, brace + 1)
+        else:
+            end = css.find("}", brace)
+            body, i = css[brace + 1:end].strip(), end + 1
+        blocks.append((prelude, body))
+    return blocks, len(css)
+
+def _dedupe(blocks):
+    # 완전히 같은 규칙은 캐스케이드를 결정하는 마지막 것만 남긴다
+    seen, result = set(), []
+    for prelude, body in reversed(blocks):
+        if isinstance(body, list):
+            body = _dedupe(body)
+            key = (prelude, repr(body))
+        else:
+            key = (prelude, body)
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append((prelude, body))
+    result.reverse()
+    return result
+
+def _serialize_css(blocks):
+    parts = []
+    for prelude, body in blocks:
+        if isinstance(body, list):
+            parts.append(f"{prelude}{{{_serialize_css(body)}}}")
+        else:
+            selector = _SELECTOR_SPACE_RE.sub(r"\1", prelude)
+            declarations = _DECLARATION_SPACE_RE.sub(r"\1", body).rstrip(";")
+            parts.append(f"{selector}{{{declarations}}}")
+    return "".join(parts)
+
+def optimize_html(html):
+    classes = {}
+
+    def replace_tag(match):
+        tag, attrs = match.groups()
+        style_match = _STYLE_ATTR_RE.search(attrs)
+        if not style_match:
+            return match.group(0)
+        declarations = _normalize_declarations(style_match.group(1))
+        attrs = attrs[:style_match.start()] + attrs[style_match.end():]
+        if not declarations:
+            return f"<{tag}{attrs}>"
+        class_name = classes.setdefault(declarations, f"s{len(classes):x}")
+        class_match = _CLASS_ATTR_RE.search(attrs)
+        if class_match:
+            attrs = f'{attrs[:class_match.start()]} class="{class_match.group(1)} {class_name}"{attrs[class_match.end():]}'
+        else:
+            attrs = f' class="{class_name}"{attrs}'
+        return f"<{tag}{attrs}>"
+
+    optimized = _TAG_GAP_RE.sub("><", html.strip())
+    optimized = _START_TAG_RE.sub(replace_tag, optimized)
+
+    # 인라인 스타일은 일반 규칙보다 우선하므로, 생성한 클래스 규칙은 !important로 같은 우선순위를 유지한다
+    generated = [(f".{class_name}", ";".join(f"{declaration}!important" for declaration in declarations.split(";")))
+                 for declarations, class_name in classes.items()]
+
+    def replace_style(match):
+        blocks, _ = _parse_css(match.group(1))
+        return f"<style>{_serialize_css(_dedupe(blocks + generated))}</style>"
+
+    optimized = _STYLE_BLOCK_RE.sub(replace_style, optimized, count=1)
+    stats = OptimizeStats(len(html.encode("utf-8")), len(optimized.encode("utf-8")), len(classes))
+    return optimized, stats
+
+def write_optimized_html(data, dest, cache=None):
+    optimized, stats = optimize_html(render_html(data, cache))
+    with atomic_output(dest) as f:
+        f.write(optimized.encode("utf-8"))
+    return stats
+
+def describe_stats(stats):
+    saved = stats.bytes_before - stats.bytes_after
+    percent = saved / stats.bytes_before * 100 if stats.bytes_before else 0.0
+    return f"{stats.bytes_before:,} → {stats.bytes_after:,} 바이트 ({percent:.1f}% 감소, 스타일 클래스 {stats.class_count}개)"
@@ -0,0 +1,206 @@
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from newsletter_render import COLOR_INFO, COMPILED_HTML_HEAD, COMPILED_HTML_TAIL, escape_text, render_content, render_section
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+PREVIEW_HOST = "127.0.0.1"
+KEEPALIVE_SEC = 15.0
+
+# 미리보기 페이지에 덧붙이는 스크립트. 서버가 보낸 조각으로 바뀐 요소만 교체한다
+CLIENT_SCRIPT = """<script>(function(){
+var es=new EventSource('/events?since=__VERSION__');
+function main(){return document.querySelector('main.container');}
+es.onmessage=function(e){
+var m=JSON.parse(e.data);
+if(m.reload){es.close();location.reload();return;}
+m.ops.forEach(function(o){
+if(o.op==='title'){document.title=o.text;}
+else if(o.op==='header'){document.querySelector('header.header').outerHTML=o.html;}
+else if(o.op==='sections'){main().innerHTML=o.html;}
+else if(o.op==='section'){main().children[o.index].outerHTML=o.html;}
+else if(o.op==='content'){main().children[o.section].querySelector('.main-content').children[o.index].outerHTML=o.html;}
+});
+};
+})();</script>"""
+
+# =================================================================================
+# 미리보기 조각
+# =================================================================================
+class PreviewSnapshot:
+    # 마지막으로 보낸 문서를 섹션/콘텐츠 조각 단위로 기억해 다음 변경과 비교한다
+    __slots__ = ("title", "head_html", "header_html", "section_keys", "sections_html", "contents_html")
+
+    def __init__(self, data, cache=None):
+        header = data.get("header", {})
+        self.title = f"{header.get('main_title', '')}_{header.get('issue_no', '')}_{header.get('issue_date', '')}"
+        self.head_html = COMPILED_HTML_HEAD.render(
+            html_title=escape_text(self.title),
+            main_title=escape_text(header.get("main_title", "")),
+            issue_no=escape_text(header.get("issue_no", "")),
+            issue_date=escape_text(header.get("issue_date", ""))
+        )
+        start = self.head_html.index("<header")
+        end = self.head_html.index("</header>") + len("</header>")
+        self.header_html = self.head_html[start:end]
+
+        self.section_keys, self.sections_html, self.contents_html = [], [], []
+        for section_data in data.get("sections", []):
+            section_color = section_data.get("color", COLOR_INFO)
+            contents = section_data.get("contents", [])
+            # 섹션 자체 필드나 콘텐츠 개수가 바뀌면 섹션 전체를, 아니면 바뀐 콘텐츠만 보낸다
+            self.section_keys.append((tuple((key, value) for key, value in section_data.items() if key != "contents"), len(contents)))
+            self.sections_html.append(render_section(section_data, cache))
+            self.contents_html.append([render_content(content_data, section_color, cache) for content_data in contents])
+
+    def page_html(self, version):
+        return "".join((self.head_html, *self.sections_html, COMPILED_HTML_TAIL.render().replace("</body>", CLIENT_SCRIPT.replace("__VERSION__", str(version)) + "</body>")))
+
+def diff_snapshots(old, new):
+    ops = []
+    if old.title != new.title:
+        ops.append({"op": "title", "text": new.title})
+    if old.header_html != new.header_html:
+        ops.append({"op": "header", "html": new.header_html})
+    if len(old.sections_html) != len(new.sections_html):
+        ops.append({"op": "sections", "html": "".join(new.sections_html)})
+        return ops
+    for index, (old_key, new_key) in enumerate(zip(old.section_keys, new.section_keys)):
+        if old.sections_html[index] == new.sections_html[index]:
+            continue
+        if old_key != new_key:
+            ops.append({"op": "section", "index": index, "html": new.sections_html[index]})
+            continue
+        for content_index, (old_html, new_html) in enumerate(zip(old.contents_html[index], new.contents_html[index])):
+            if old_html != new_html:
+                ops.append({"op": "content", "section": index, "index": content_index, "html": new_html})
+    return ops
+
+# =================================================================================
+# 미리보기 서버
+# =================================================================================
+class PreviewServer:
+    # localhost에서 현재 문서를 보여 주고, 변경된 조각을 Server-Sent Events로 밀어 준다
+    def __init__(self, cache=None, host=PREVIEW_HOST, port=0):
+        self.cache = cache
+        self.version = 0
+        self.snapshot = None
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="newsletter-preview", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def has_clients(self):
+        with self._lock:
+            return bool(self._clients)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def publish(self, data):
+        # Tk 스레드에서 호출된다. 렌더 캐시 덕분에 바뀐 조각만 실제로 렌더링된다
+        snapshot = PreviewSnapshot(data, self.cache)
+        if self.cache is not None:
+            # iter_html을 거치지 않으므로 새 조각을 직접 디스크에 내보내 대기 목록이 쌓이지 않게 한다
+            self.cache.flush()
+        with self._lock:
+            previous = self.snapshot
+            ops = diff_snapshots(previous, snapshot) if previous is not None else None
+            if ops == []:
+                return 0
+            self.version += 1
+            self.snapshot = snapshot
+            message = json.dumps({"version": self.version, "ops": ops} if ops is not None else {"reload": True}, ensure_ascii=False)
+            for client in self._clients:
+                client.put(message)
+        return len(ops or ())
+
+    def _page(self):
+        with self._lock:
+            if self.snapshot is None:
+                return None
+            return self.snapshot.page_html(self.version)
+
+    def _subscribe(self, since):
+        client = queue.Queue()
+        with self._lock:
+            if since != self.version:
+                # 페이지를 받은 뒤 놓친 변경이 있으면 새로고침으로 맞춘다
+                client.put(json.dumps({"reload": True}))
+            self._clients.add(client)
+        return client
+
+    def _unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    def close(self):
+        with self._lock:
+            for client in self._clients:
+                client.put(None)
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+def _make_handler(server):
+    class PreviewHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == "/":
+                self._send_page()
+            elif url.path == "/events":
+                self._stream_events(parse_qs(url.query).get("since", ["-1"])[0])
+            else:
+                self.send_error(404)
+
+        def _send_page(self):
+            page = server._page()
+            if page is None:
+                self.send_error(503, "미리보기 문서가 아직 준비되지 않았습니다")
+                return
+            body = page.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream_events(self, since):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            client = server._subscribe(int(since) if since.lstrip("-").isdigit() else -1)
+            try:
+                while True:
+                    try:
+                        message = client.get(timeout=KEEPALIVE_SEC)
+                    except queue.Empty:
+                        self.wfile.write(b": keepalive\n\n")
+                    else:
+                        if message is None:
+                            break
+                        self.wfile.write(f"data: {message}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                server._unsubscribe(client)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PreviewHandler
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+# NEWSLETTER_PROFILE=1 이면 시작부터 계측한다.
+# NEWSLETTER_PROFILE_LOG=파일.json 은 Chrome 트레이스(chrome://tracing, Perfetto), 파일.jsonl 은 JSON Lines로 기록한다
+PROFILE_ENV = "NEWSLETTER_PROFILE"
+PROFILE_LOG_ENV = "NEWSLETTER_PROFILE_LOG"
+
+_NULL_SPAN = nullcontext()
+
+# =================================================================================
+# 계측기
+# =================================================================================
+class _Span:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.started, self.started)
+        return False
+
+class Profiler:
+    # 구간별 횟수·누적·최대 시간과 이름별 카운터(위젯 수, 기록 바이트)를 모은다.
+    # 꺼져 있을 때 span()은 공유된 nullcontext를 돌려주므로 비용이 거의 없다.
+    # 자동 저장 스레드에서도 호출되므로 잠금으로 보호한다
+    def __init__(self, enabled=False, log_path=None):
+        self.enabled = False
+        self.log_path = log_path
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+        self._log = None
+        self._chrome = False
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        # 로그 파일은 계측을 처음 켤 때 연다. 계측하지 않는 CLI가 이 모듈을 불러와도 기존 로그를 덮어쓰지 않는다
+        if enabled and self.log_path and self._log is None:
+            self.open_log(self.log_path)
+        self.enabled = enabled
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds, started=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._timings.get(name)
+            if stats is None:
+                stats = self._timings[name] = [0, 0.0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] = seconds
+            if self._log is not None:
+                started = started if started is not None else time.perf_counter() - seconds
+                self._write_event({"name": name, "ph": "X", "ts": round((started - self.origin) * 1e6), "dur": round(seconds * 1e6), "pid": os.getpid(), "tid": threading.get_ident()})
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self._counters[name] = self._counters.get(name, 0) + amount
+            if self._log is not None:
+                self._write_event({"name": name, "ph": "C", "ts": round((time.perf_counter() - self.origin) * 1e6), "pid": os.getpid(), "args": {name: total}})
+
+    def snapshot(self):
+        # (이름, 횟수, 누적초, 최대초, 마지막초) 목록과 카운터 사전
+        with self._lock:
+            timings = [(name, *stats) for name, stats in self._timings.items()]
+            return sorted(timings, key=lambda row: row[2], reverse=True), dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    # ---- 로그 ---------------------------------------------------------------
+    def open_log(self, path):
+        # Chrome 트레이스의 JSON 배열 형식은 닫는 ]가 없어도 읽히므로 두 형식 모두 이벤트마다 한 줄씩 이어 쓴다
+        self.close_log()
+        self._chrome = not str(path).endswith(".jsonl")
+        self._log = open(path, 'w', encoding='utf-8')
+        if self._chrome:
+            self._log.write("[\n")
+
+    def _write_event(self, event):
+        self._log.write(json.dumps(event, ensure_ascii=False) + (",\n" if self._chrome else "\n"))
+
+    def close_log(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+profiler = Profiler(os.environ.get(PROFILE_ENV) == "1", os.environ.get(PROFILE_LOG_ENV))
+
+def count_widgets(widget, exclude=None):
+    # widget과 그 자손 위젯 수. exclude 위젯의 자손은 따로 계측되므로 세지 않는다
+    if widget is exclude:
+        return 1
+    return 1 + sum(count_widgets(child, exclude) for child in widget.winfo_children())
@@ -0,0 +1,294 @@
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import string
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+COLOR_INFO = "#6c757d"
+LINK_TEXT = "바로가기 링크 &rarr;"
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# =================================================================================
+# HTML 템플릿
+# =================================================================================
+HTML_TEMPLATE = """
+<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"><title>{html_title}</title><link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet"><style>body{{font-family:'Noto Sans KR',sans-serif;margin:0;background-color:#f0f2f5;color:#333}}.header{{display:flex;justify-content:space-between;align-items:center;background-image:url('your_header_img_here.jpg');background-size:cover;background-position:center;padding:20px 40px;color:white;min-height:150px;position:relative;z-index:1}}.header::before{{content:'';position:absolute;top:0;left:0;right:0;bottom:0;background-color:rgba(0,0,0,0.4);z-index:2}}.header .logo,.header .issue-info{{z-index:3;position:relative}}.header .logo-text{{font-size:2.5em;font-weight:bold;text-shadow:2px 2px 4px rgba(0,0,0,0.7)}}.header .issue-info{{font-size:1.2em;background-color:#f1b34a;padding:8px 15px;border-radius:5px;position:absolute;right:40px;bottom:20px}}.container{{padding:20px}}.info-card{{display:flex;width:100%;max-width:800px;margin:25px auto;border-radius:10px;overflow:hidden;box-shadow:0 4px 12px rgba(0,0,0,0.1);background-color:#fff}}.card-sidebar{{display:flex;justify-content:center;align-items:center;flex-shrink:0;width:70px;padding:20px 0;writing-mode:vertical-rl;text-orientation:mixed;color:white;font-size:1.5em;font-weight:700;letter-spacing:2px;text-align:center;transition:all 0.3s ease}}.card-main{{flex-grow:1;display:flex;flex-direction:column}}.main-header{{padding:12px 20px;color:white;font-size:1.2em;font-weight:700}}.main-content{{padding:20px;line-height:1.8}}.content-item{{margin-bottom:20px;border-bottom:1px solid #eee;padding-bottom:15px}}.content-item:last-child{{border-bottom:none;margin-bottom:0;padding-bottom:0}}.content-item-title{{font-size:1.1em;font-weight:500;margin-bottom:8px}}.content-item-body{{color:#555}}a{{text-decoration:none;color:inherit}}a:hover{{text-decoration:underline}}@media (max-width:768px){{.header{{padding:20px 15px}}.header .logo-text{{font-size:2em}}.header .issue-info{{font-size:1em;padding:6px 10px;right:15px;bottom:15px}}.container{{padding:15px 10px}}.info-card{{flex-direction:column;margin:15px auto;border-left:none}}.card-sidebar{{writing-mode:horizontal-tb;text-orientation:initial;width:auto;padding:10px 15px;justify-content:flex-start;font-size:1.3em}}.main-content{{padding:15px}}}}</style></head><body><header class="header"><div class="logo"><span class="logo-text">{main_title}</span></div><div class="issue-info">제 {issue_no}호 / {issue_date}</div></header><main class="container">{sections_html}</main></body></html>
+"""
+
+SECTION_TEMPLATE = """
+<div class="info-card" style="border-left:5px solid {color};"><div class="card-sidebar" style="background-color:{color};">{sidebar_title}</div><div class="card-main"><div class="main-header" style="background-color:{color};">{section_title}</div><div class="main-content">{contents_html}</div></div></div>
+"""
+
+CONTENT_TEMPLATE = """
+<div class="content-item"><div class="content-item-title" style="color:{color};font-weight:{font_weight};">{content_title}</div><div class="content-item-body">{content_body}</div></div>
+"""
+
+LINK_TEMPLATE = """<p style="margin-top:15px;text-align:right;font-size:0.9em;"><a href="{link_url}" target="_blank" style="color:{color};font-weight:500;text-decoration:none;border-bottom:1px solid {color};padding-bottom:2px;">{link_text}</a></p>"""
+
+# =================================================================================
+# 템플릿 컴파일 및 이스케이프
+# =================================================================================
+_CSS_UNSAFE_RE = re.compile(r"[^#\w(),.%\s-]")
+
+def escape_text(value):
+    # 특수문자가 없는 대부분의 텍스트는 replace를 건너뛴다
+    value = str(value)
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    return value
+
+def escape_attr(value):
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "'" in value:
+        value = value.replace("'", "&#x27;")
+    return value
+
+@functools.lru_cache(maxsize=256)
+def escape_css(value):
+    # style 속성 안에서 선언을 끊거나 속성을 벗어날 수 있는 문자를 제거
+    return _CSS_UNSAFE_RE.sub("", str(value))
+
+class CompiledTemplate:
+    # str.format 템플릿을 한 번만 파싱해 f-string 함수로 컴파일
+    __slots__ = ("fields", "render")
+
+    def __init__(self, template):
+        literal_parts, fields = [], []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            literal_parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                raise ValueError(f"지원하지 않는 템플릿 필드입니다: {field!r}")
+            literal_parts.append(f"{{{field}}}")
+            fields.append(field)
+        self.fields = tuple(dict.fromkeys(fields))
+        params = f"*, {', '.join(self.fields)}" if self.fields else ""
+        source = f"def render({params}):\n    return f{''.join(literal_parts)!r}\n"
+        namespace = {}
+        exec(compile(source, "<template>", "exec"), namespace)
+        self.render = namespace["render"]
+
+    def __call__(self, **fields):
+        return self.render(**fields)
+
+# 스트리밍 렌더링을 위해 섹션 목록 앞뒤로 나누어 컴파일
+COMPILED_HTML_HEAD, COMPILED_HTML_TAIL = map(CompiledTemplate, HTML_TEMPLATE.split("{sections_html}"))
+COMPILED_SECTION = CompiledTemplate(SECTION_TEMPLATE)
+COMPILED_CONTENT = CompiledTemplate(CONTENT_TEMPLATE)
+COMPILED_LINK = CompiledTemplate(LINK_TEMPLATE)
+
+# =================================================================================
+# 렌더링
+# =================================================================================
+TEMPLATE_VERSION = hashlib.sha1("".join((HTML_TEMPLATE, SECTION_TEMPLATE, CONTENT_TEMPLATE, LINK_TEMPLATE)).encode("utf-8")).hexdigest()[:12]
+
+# 템플릿이 실제로 읽는 필드만 키에 넣는다. 그 밖의 필드(태그 목록 등)는 출력에 영향이 없다
+CONTENT_KEY_FIELDS = ("title", "body", "link", "color", "is_bold")
+SECTION_KEY_FIELDS = ("sidebar_title", "title", "color")
+
+def fragment_key(kind, data, fields, *extra):
+    # 문자열 해시는 파이썬이 캐시하므로 튜플 키가 JSON 직렬화 후 해싱보다 훨씬 싸다.
+    # 템플릿이 바뀌면 TEMPLATE_VERSION이 달라져 이전 조각은 자연히 무효화된다
+    key = (TEMPLATE_VERSION, kind, *extra, *[(field, data[field]) for field in fields if field in data])
+    try:
+        hash(key)
+    except TypeError:
+        # 필드 값이 목록·사전인 비정상 데이터는 JSON 다이제스트로 대신한다
+        digest = hashlib.sha1(json.dumps(key, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        key = (TEMPLATE_VERSION, kind, digest)
+    return key
+
+def _render_content(content_data, section_color):
+    color = escape_css(content_data.get("color") or section_color)
+    body_text = escape_text(content_data.get("body") or "")
+    if "\n" in body_text:
+        body_text = body_text.replace("\n", "<br>")
+    link_url = content_data.get("link")
+    if link_url:
+        body_text += COMPILED_LINK.render(link_url=escape_attr(link_url), color=color, link_text=LINK_TEXT)
+    return COMPILED_CONTENT.render(
+        color=color,
+        font_weight="bold" if content_data.get("is_bold") else "normal",
+        content_title=escape_text(content_data.get("title") or "") or "&nbsp;",
+        content_body=body_text
+    )
+
+def _render_section(section_data, contents_html):
+    return COMPILED_SECTION.render(
+        sidebar_title=escape_text(section_data.get("sidebar_title", "")),
+        section_title=escape_text(section_data.get("title") or "") or "&nbsp;",
+        color=escape_css(section_data.get("color", COLOR_INFO)),
+        contents_html=contents_html
+    )
+
+def render_content(content_data, section_color, cache=None, key=None):
+    if cache is None:
+        return _render_content(content_data, section_color)
+    key = key or fragment_key("content", content_data, CONTENT_KEY_FIELDS, section_color)
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = _render_content(content_data, section_color)
+        cache.put(key, fragment)
+    return fragment
+
+def render_section(section_data, cache=None):
+    section_color = section_data.get("color", COLOR_INFO)
+    contents = section_data.get("contents", [])
+    if cache is None:
+        return _render_section(section_data, "".join([_render_content(content_data, section_color) for content_data in contents]))
+
+    # 섹션 키는 섹션 필드와 각 콘텐츠 키로 구성되어, 바뀐 콘텐츠만 다시 렌더링된다
+    content_keys = [fragment_key("content", content_data, CONTENT_KEY_FIELDS, section_color) for content_data in contents]
+    key = fragment_key("section", section_data, SECTION_KEY_FIELDS, *content_keys)
+    fragment = cache.get(key)
+    if fragment is None:
+        contents_html = "".join([render_content(content_data, section_color, cache, content_key) for content_data, content_key in zip(contents, content_keys)])
+        fragment = _render_section(section_data, contents_html)
+        cache.put(key, fragment)
+    return fragment
+
+def iter_html(data, cache=None):
+    header = data.get("header", {})
+    html_title = f"{header.get('main_title', '')}_{header.get('issue_no', '')}_{header.get('issue_date', '')}"
+    yield COMPILED_HTML_HEAD.render(
+        html_title=escape_text(html_title),
+        main_title=escape_text(header.get("main_title", "")),
+        issue_no=escape_text(header.get("issue_no", "")),
+        issue_date=escape_text(header.get("issue_date", ""))
+    )
+    for section_data in data.get("sections", []):
+        yield render_section(section_data, cache)
+    if cache is not None:
+        cache.flush()
+    yield COMPILED_HTML_TAIL.render()
+
+def render_html(data, cache=None):
+    return "".join(iter_html(data, cache))
+
+@contextlib.contextmanager
+def atomic_output(path, buffer_size=STREAM_BUFFER_SIZE, fsync=False):
+    # 같은 디렉터리의 임시 파일에 쓰고 끝까지 성공했을 때만 교체한다. 도중에 실패하면 기존 파일이 그대로 남는다.
+    # fsync=True면 교체 전에 디스크에 내려 전원이 꺼져도 빈 파일이 남지 않게 한다
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb', buffering=buffer_size) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp는 0600으로 만들므로 일반 파일과 같은 권한으로 맞춘다
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def write_html(data, sink, cache=None, buffer_size=STREAM_BUFFER_SIZE):
+    # sink는 파일 경로 또는 write()를 가진 파일 객체. 기록한 바이트 수를 돌려준다
+    if isinstance(sink, (str, os.PathLike)):
+        with atomic_output(sink, buffer_size) as f:
+            return write_html(data, f, cache)
+    text_mode = isinstance(sink, io.TextIOBase)
+    written = 0
+    for chunk in iter_html(data, cache):
+        encoded = chunk.encode('utf-8')
+        sink.write(chunk if text_mode else encoded)
+        written += len(encoded)
+    return written
+
+def render_file(src, dest, optimize=False):
+    with Path(src).open('r', encoding='utf-8') as f:
+        data = json.load(f)
+    if optimize:
+        from newsletter_optimize import write_optimized_html
+        return write_optimized_html(data, dest).bytes_after
+    return write_html(data, dest)
+
+# =================================================================================
+# 일괄 렌더링 (CLI)
+# =================================================================================
+def _render_job(job):
+    src, dest, optimize = job
+    try:
+        return src, dest, render_file(src, dest, optimize), None
+    except Exception as e:
+        return src, dest, 0, f"{type(e).__name__}: {e}"
+
+def collect_inputs(paths):
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.json")))
+        else:
+            files.append(path)
+    return files
+
+def render_batch(files, output_dir=None, jobs=None, optimize=False):
+    jobs_list = []
+    for src in files:
+        dest_dir = Path(output_dir) if output_dir else src.parent
+        jobs_list.append((str(src), str(dest_dir / f"{src.stem}.html"), optimize))
+
+    workers = jobs or os.cpu_count() or 1
+    if workers == 1 or len(jobs_list) <= 1:
+        yield from map(_render_job, jobs_list)
+        return
+    chunksize = max(1, len(jobs_list) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_render_job, jobs_list, chunksize=chunksize)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="백업 JSON 파일을 HTML 뉴스레터로 일괄 변환합니다.")
+    parser.add_argument("inputs", nargs="*", default=["backups"], help="JSON 파일 또는 디렉터리 (기본값: backups)")
+    parser.add_argument("-o", "--output-dir", help="HTML 파일을 저장할 디렉터리 (기본값: 원본과 같은 위치)")
+    parser.add_argument("-j", "--jobs", type=int, help="동시에 실행할 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--optimize", action="store_true", help="인라인 스타일을 클래스로 바꾸고 공백을 줄여 출력 크기를 최적화")
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.inputs)
+    if args.output_dir:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    done, failed, total_bytes = 0, 0, 0
+    for src, dest, written, error in render_batch(files, args.output_dir, args.jobs, args.optimize):
+        if error:
+            failed += 1
+            print(f"[실패] {src}: {error}", file=sys.stderr)
+        else:
+            done += 1
+            total_bytes += written
+    elapsed = time.perf_counter() - started
+
+    rate = len(files) / elapsed if elapsed > 0 else 0.0
+    print(f"{done}개 성공, {failed}개 실패 / {elapsed:.2f}초 ({rate:.1f} 파일/초), {total_bytes:,} 바이트 기록")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from newsletter_backup import BACKUP_KEEP_VERSIONS, BackupStore
+
+# =================================================================================
+# 상수 정의
+# =================================================================================
+INDEX_FILE = "search.sqlite3"
+WORKING_DOC_ID = "working"
+
+SearchHit = namedtuple("SearchHit", "doc_id main_title issue_no issue_date version_id section_index content_index snippet score")
+
+# =================================================================================
+# 전문 검색 색인
+# =================================================================================
+class SearchIndex:
+    # SQLite FTS5 색인. 문서(호) 단위로 갱신하며, 내용이 그대로면 다시 색인하지 않는다.
+    # 자동 저장 스레드에서도 호출되므로 연결 하나를 잠금으로 보호한다
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute("""CREATE TABLE IF NOT EXISTS docs (
+                doc_id TEXT PRIMARY KEY,
+                main_title TEXT NOT NULL,
+                issue_no TEXT NOT NULL,
+                issue_date TEXT NOT NULL,
+                version_id INTEGER,
+                digest TEXT NOT NULL,
+                updated_at REAL NOT NULL)""")
+            self._db.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+                doc_id UNINDEXED, section_index UNINDEXED, content_index UNINDEXED,
+                title, body, link,
+                tokenize = 'unicode61 remove_diacritics 2')""")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def issue_doc_id(header):
+        return "\x1f".join((header.get("main_title", ""), header.get("issue_no", ""), header.get("issue_date", "")))
+
+    @staticmethod
+    def _rows(doc_id, data):
+        # 헤더는 section_index -1, 섹션 제목은 content_index -1 행으로 색인한다
+        header = data.get("header", {})
+        yield doc_id, -1, -1, " ".join(str(header.get(key, "")) for key in ("main_title", "issue_no", "issue_date")), "", ""
+        for section_index, section_data in enumerate(data.get("sections", [])):
+            yield doc_id, section_index, -1, f"{section_data.get('sidebar_title', '')} {section_data.get('title', '')}", "", ""
+            for content_index, content_data in enumerate(section_data.get("contents", [])):
+                yield doc_id, section_index, content_index, content_data.get("title", ""), content_data.get("body", ""), content_data.get("link", "")
+
+    def index_document(self, doc_id, data, version_id=None):
+        digest = hashlib.sha1(json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        header = data.get("header", {})
+        with self._lock, self._db:
+            row = self._db.execute("SELECT digest, version_id FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row and row[0] == digest and (version_id is None or row[1] == version_id):
+                return False
+            self._db.execute("DELETE FROM entries WHERE doc_id = ?", (doc_id,))
+            self._db.executemany("INSERT INTO entries (doc_id, section_index, content_index, title, body, link) VALUES (?, ?, ?, ?, ?, ?)", self._rows(doc_id, data))
+            self._db.execute(
+                "INSERT OR REPLACE INTO docs (doc_id, main_title, issue_no, issue_date, version_id, digest, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (doc_id, header.get("main_title", ""), header.get("issue_no", ""), header.get("issue_date", ""), version_id, digest, time.time())
+            )
+        return True
+
+    def remove_document(self, doc_id):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries WHERE doc_id = ?", (doc_id,))
+            self._db.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+
+    @staticmethod
+    def build_query(text):
+        # 한국어 조사가 붙은 단어도 찾도록 각 단어를 접두어 검색으로 바꾼다
+        terms = [term.replace('"', '""') for term in text.split()]
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search(self, text, limit=50):
+        query = self.build_query(text)
+        if not query:
+            return []
+        with self._lock:
+            rows = self._db.execute("""
+                SELECT e.doc_id, d.main_title, d.issue_no, d.issue_date, d.version_id, e.section_index, e.content_index,
+                       snippet(entries, -1, '[', ']', '…', 10), bm25(entries, 0, 0, 0, 5.0, 1.0, 0.5) AS score
+                FROM entries AS e JOIN docs AS d ON d.doc_id = e.doc_id
+                WHERE entries MATCH ?
+                ORDER BY score LIMIT ?""", (query, limit)).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def sync(self, store):
+        # 저장소의 버전이 지워지거나 가져와진 뒤 호출한다. 각 호의 최신 버전을 가리키지 않는 문서만 다시 색인하고,
+        # 저장소에 더 이상 없는 호의 문서는 지운다. 돌려주는 값은 (다시 색인한 수, 지운 수)
+        latest = {self.issue_doc_id(version._asdict()): version for version, _ in store.latest_versions()}
+        with self._lock:
+            indexed = dict(self._db.execute("SELECT doc_id, version_id FROM docs WHERE doc_id != ?", (WORKING_DOC_ID,)))
+        stale = [doc_id for doc_id in indexed if doc_id not in latest]
+        for doc_id in stale:
+            self.remove_document(doc_id)
+        reindexed = 0
+        for doc_id, version in latest.items():
+            if indexed.get(doc_id) != version.id:
+                self.index_document(doc_id, store.load(version.id), version.id)
+                reindexed += 1
+        return reindexed, len(stale)
+
+    def rebuild(self, store):
+        # 저장소의 각 호 최신 버전으로 색인을 다시 만든다
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries WHERE doc_id != ?", (WORKING_DOC_ID,))
+            self._db.execute("DELETE FROM docs WHERE doc_id != ?", (WORKING_DOC_ID,))
+        seen = set()
+        for version in store.list_versions():
+            key = (version.main_title, version.issue_no, version.issue_date)
+            if key in seen:
+                continue
+            seen.add(key)
+            data = store.load(version.id)
+            self.index_document(self.issue_doc_id(data.get("header", {})), data, version.id)
+        return len(seen)
+
+# =================================================================================
+# 수동 백업
+# =================================================================================
+def save_backup(store, index, data, keep_last=BACKUP_KEEP_VERSIONS):
+    # App.manual_save와 벤치마크가 함께 쓰는 백업 순서: 버전 저장, 그 호만 보존 정책 적용, 검색 색인.
+    # 객체 정리는 저장 경로에서 하지 않는다 (newsletter_backup.py gc)
+    header = data.get("header", {})
+    version_id = store.save(data)
+    store.prune(keep_last=keep_last, issue=(header.get("main_title", ""), header.get("issue_no", ""), header.get("issue_date", "")), collect=False)
+    index.index_document(SearchIndex.issue_doc_id(header), data, version_id)
+    return version_id
+
+# =================================================================================
+# CLI
+# =================================================================================
+def describe_location(hit):
+    if hit.section_index < 0:
+        return "헤더"
+    if hit.content_index < 0:
+        return f"섹션 {hit.section_index + 1}"
+    return f"섹션 {hit.section_index + 1} / 콘텐츠 {hit.content_index + 1}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 뉴스레터 전체에서 검색합니다.")
+    parser.add_argument("query", nargs="*", help="검색어")
+    parser.add_argument("--root", default="backups", help="백업 디렉터리 (기본값: backups)")
+    parser.add_argument("-n", "--limit", type=int, default=20)
+    parser.add_argument("--rebuild", action="store_true", help="백업 저장소에서 색인을 다시 만든다")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    root.mkdir(parents=True, exist_ok=True)
+    index = SearchIndex(root / INDEX_FILE)
+    try:
+        if args.rebuild:
+            store = BackupStore(root)
+            try:
+                print(f"{index.rebuild(store)}개 호 색인 완료")
+            finally:
+                store.close()
+        if args.query:
+            started = time.perf_counter()
+            hits = index.search(" ".join(args.query), args.limit)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            for hit in hits:
+                issue = "(작성 중)" if hit.doc_id == WORKING_DOC_ID else f"#{hit.version_id}"
+                snippet = hit.snippet.replace("\n", " ")
+                print(f"{issue}\t{hit.main_title} 제 {hit.issue_no}호 {hit.issue_date}\t{describe_location(hit)}\t{snippet}")
+            print(f"{len(hits)}건 / {elapsed_ms:.1f}ms", file=sys.stderr)
+    finally:
+        index.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())